@@ -1,28 +1,71 @@
 # Advent of Code, 2015
 # Day 4
 # 11/30/2020
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from hashlib import md5
+import os
 
-def miner(secret_key, n):
+CHUNK_SIZE = 100000
 
-    val = 1
 
-    while True:
-        md5hash = md5((secret_key + str(val)).encode('utf-8')).hexdigest()
+def mine_chunk(secret_key, n, start, stop):
+    """
+    Return the first value in [start, stop) whose hash starts with n zeros, or None.
+    """
+    # The secret key is hashed once and the state copied for each value. A hash with n leading zero
+    # nibbles is just a raw digest below 16**(32 - n), and equal length bytes compare numerically.
+    prefix = md5(secret_key.encode('utf-8'))
+    threshold = (16 ** (32 - n)).to_bytes(16, 'big') if n > 0 else b'\xff' * 17
+    for val in range(start, stop):
+        md5hash = prefix.copy()
+        md5hash.update(str(val).encode('ascii'))
+        if md5hash.digest() < threshold:
+            return val
+    return None
 
-        if md5hash[:n] == '0'*n:
-            break
-        
-        val += 1
-    
-    return val
 
-puzzle_input = 'bgvyzdsv'
+def miner(secret_key, n, jobs=1, chunk_size=CHUNK_SIZE):
+    # Anything below 1 (or None) means use every core
+    if jobs is None or jobs < 1:
+        jobs = os.cpu_count() or 1
 
-# Starts w/ 5 zeros
-val = miner(puzzle_input, 5)
-print(val)
+    if jobs == 1:
+        start = 1
+        while True:
+            val = mine_chunk(secret_key, n, start, start + chunk_size)
+            if val is not None:
+                return val
+            start += chunk_size
 
-# Starts w/ 6 zeros
-val = miner(puzzle_input, 6)
-print(val)
+    # Chunks are handed out in order and their results collected in order, so the first hit we see
+    # is the lowest one. Everything still queued after it is cancelled.
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        start = 1
+        while True:
+            while len(pending) < 2 * jobs:
+                pending.append(executor.submit(mine_chunk, secret_key, n, start, start + chunk_size))
+                start += chunk_size
+            val = pending.popleft().result()
+            if val is not None:
+                for future in pending:
+                    future.cancel()
+                return val
+
+
+if __name__ == '__main__':
+    assert mine_chunk('abcdef', 5, 609040, 609050) == 609043
+    assert miner('abcdef', 5, chunk_size=1000) == 609043
+    assert mine_chunk('pqrstuv', 5, 1048000, 1049000) == 1048970
+
+    puzzle_input = 'bgvyzdsv'
+    jobs = os.cpu_count() or 1
+
+    # Starts w/ 5 zeros
+    val = miner(puzzle_input, 5, jobs)
+    print('Part 1:', val)
+
+    # Starts w/ 6 zeros
+    val = miner(puzzle_input, 6, jobs)
+    print('Part 2:', val)
@@ -3,6 +3,7 @@
 # 12/26/2020
 
 import helper
+from operator import mul
 
 def parse_instruction(instruction):
     instruction_parts = instruction.replace('through ', '').replace('turn ', '').split(' ')
@@ -14,47 +15,65 @@ def parse_instruction(instruction):
     return action, tlc, brc
 
 
-def new_lighting_array():
-    lighting_array = [[0] * 1000 for _ in range(1000)]
-    return lighting_array
-
-
 class BinaryLightingArray(object):
+    """
+    Rather than tracking all 1000x1000 lights, the grid is cut up along every rectangle edge in the
+    instructions. Every light in a resulting block always gets the same instructions, so each block
+    is a single value. Instructions are applied a band of rows at a time to whole runs of blocks.
+    """
     def __init__(self):
-        self.lighting_array = new_lighting_array()
-    
+        self.instructions = []
+        self.bands = []
+        self.col_widths = [1000]
+
     def set_lights(self, instructions):
-        for instruction in instructions:
-            action, tlc, brc = parse_instruction(instruction)
+        self.instructions.extend(parse_instruction(instruction) for instruction in instructions)
 
-            for row in range(tlc[0], brc[0]+1):
-                for col in range(tlc[1], brc[1]+1):
-                    getattr(self, action)(row, col)
-    
-    def on(self, row, col):
-        self.lighting_array[row][col] = 1
-    def off(self, row, col):
-        self.lighting_array[row][col] = 0
-    def toggle(self, row, col):
-        self.lighting_array[row][col] = (self.lighting_array[row][col] + 1) % 2
+        row_edges = sorted({0, 1000} | {tlc[0] for _, tlc, _ in self.instructions} | {brc[0] + 1 for _, _, brc in self.instructions})
+        col_edges = sorted({0, 1000} | {tlc[1] for _, tlc, _ in self.instructions} | {brc[1] + 1 for _, _, brc in self.instructions})
+        col_index = {edge: i for i, edge in enumerate(col_edges)}
+        self.col_widths = [end - start for start, end in zip(col_edges[:-1], col_edges[1:])]
+
+        self.bands = []
+        for start, end in zip(row_edges[:-1], row_edges[1:]):
+            blocks = [0] * len(self.col_widths)
+            for action, tlc, brc in self.instructions:
+                if tlc[0] <= start and end - 1 <= brc[0]:
+                    first, last = col_index[tlc[1]], col_index[brc[1] + 1]
+                    blocks[first:last] = getattr(self, action)(blocks[first:last])
+            self.bands.append((end - start, blocks))
+
+    def on(self, lights):
+        return [1] * len(lights)
+    def off(self, lights):
+        return [0] * len(lights)
+    def toggle(self, lights):
+        return [1 - light for light in lights]
     
     def total_brightness(self):
-        return sum(light for row in self.lighting_array for light in row)
+        return sum(height * sum(map(mul, blocks, self.col_widths)) for height, blocks in self.bands)
 
 
 class LightingArray(BinaryLightingArray):
-    def on(self, row, col):
-        self.lighting_array[row][col] = self.lighting_array[row][col] + 1
-    def off(self, row, col):
-        self.lighting_array[row][col] = max([self.lighting_array[row][col] - 1, 0])
-    def toggle(self, row, col):
-        self.lighting_array[row][col] = self.lighting_array[row][col] + 2
+    def on(self, lights):
+        return [light + 1 for light in lights]
+    def off(self, lights):
+        return [light - 1 if light > 0 else 0 for light in lights]
+    def toggle(self, lights):
+        return [light + 2 for light in lights]
 
 
 assert parse_instruction('turn on 489,959 through 759,964') == ('on', (489, 959), (759, 964))
 assert parse_instruction('turn off 820,516 through 871,914') == ('off', (820, 516), (871, 914))
 assert parse_instruction('toggle 275,796 through 493,971') == ('toggle', (275, 796), (493, 971))
 
+test_array = BinaryLightingArray()
+test_array.set_lights(['turn on 0,0 through 999,999', 'toggle 0,0 through 999,0', 'turn off 499,499 through 500,500'])
+assert test_array.total_brightness() == 1000000 - 1000 - 4
+test_array = LightingArray()
+test_array.set_lights(['turn on 0,0 through 0,0', 'toggle 0,0 through 999,999', 'turn off 0,0 through 0,0', 'turn off 0,0 through 0,0'])
+assert test_array.total_brightness() == 2000000 - 1
+
 instructions = helper.read_input_lines(6)
 lighting_array = BinaryLightingArray()
 lighting_array.set_lights(instructions)
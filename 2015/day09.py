@@ -1,7 +1,7 @@
 # Advent of Code 2015, Day 9
 # Michael Bell
 # 1/5/2021
-from itertools import permutations
+from hamiltonian import hamiltonian_path
 import helper
 
 
@@ -20,22 +20,16 @@ def parse_distances(distances):
     return set(cities), p2p_distances
 
 
+def distance_matrix(cities, p2p_distances):
+    cities = sorted(cities)
+    return [
+        [0 if c1 == c2 else p2p_distances[tuple(sorted([c1, c2]))] for c2 in cities]
+        for c1 in cities
+    ]
+
+
 def get_ext_dist(cities, p2p_distances, ext='min'):
-    if ext == 'min':
-        ext_dist = sum(p2p_distances[k] for k in p2p_distances)
-    else:
-        ext_dist = -1
-
-    for candidate_city_list in permutations(cities, len(cities)):
-        candidate_dist = 0
-        for c1, c2 in zip(candidate_city_list[:-1], candidate_city_list[1:]):
-            city_pair = tuple(sorted([c1, c2]))
-            candidate_dist += p2p_distances[city_pair]
-        
-        if (ext == 'min' and candidate_dist < ext_dist) or (ext == 'max' and candidate_dist > ext_dist):
-            ext_dist = candidate_dist
-        
-    return ext_dist
+    return hamiltonian_path(distance_matrix(cities, p2p_distances), longest=(ext == 'max'))
 
 
 example_distances = '''London to Dublin = 464
@@ -44,6 +38,7 @@ Dublin to Belfast = 141'''.split('\n')
 
 cities, p2p_distances = parse_distances(example_distances)
 assert get_ext_dist(cities, p2p_distances) == 605
+assert get_ext_dist(cities, p2p_distances, 'max') == 982
 
 distances = helper.read_input_lines(9)
 cities, p2p_distances = parse_distances(distances)
@@ -1,32 +1,244 @@
 # Advent of Code 2015, Day 10
 # Michael Bell
 # 1/6/2021
+from collections import Counter
+from itertools import groupby
+import random
+
+
+def look_and_say(digits):
+    """
+    Lazily yield the digits of the next term for a stream of digits.
+    """
+    for digit, run in groupby(digits):
+        yield from str(sum(1 for _ in run))
+        yield digit
+
+
+def look_and_say_stream(starting_number, iterations):
+    """
+    Stream the digits of the sequence after the given number of iterations without ever holding a
+    whole term in memory, for when the actual digits are needed.
+    """
+    digits = iter(starting_number)
+    for _ in range(iterations):
+        digits = look_and_say(digits)
+    return digits
 
 
 def play_game(starting_number, iterations):
     number = starting_number
     for _ in range(iterations):
-        new_number = ''
-        while len(number) > 0:
-            current_digit = number[0]
-            n_occurrences = 0
-            for dig in number:
-                if dig == current_digit:
-                    n_occurrences += 1
-                else:
-                    break
-            new_number += f'{n_occurrences}{current_digit}'
-            number = number[n_occurrences:]
-        number = new_number
+        number = ''.join(look_and_say(number))
     return number
 
 
+# Conway showed that the sequence "atomizes" into 92 elements that never interact with their
+# neighbours again, so we only need to count how many of each element there are. The table is
+# his, in atomic number order, giving each element's digits and the elements it decays into.
+# https://www.youtube.com/watch?v=ea7lJkEhytA
+# J. H. Conway, The Weird and Wonderful Chemistry of Audioactive Decay (1987)
+PERIODIC_TABLE = (
+    ('H', '22', 'H'),
+    ('He', '13112221133211322112211213322112', 'Hf Pa H Ca Li'),
+    ('Li', '312211322212221121123222112', 'He'),
+    ('Be', '111312211312113221133211322112211213322112', 'Ge Ca Li'),
+    ('B', '1321132122211322212221121123222112', 'Be'),
+    ('C', '3113112211322112211213322112', 'B'),
+    ('N', '111312212221121123222112', 'C'),
+    ('O', '132112211213322112', 'N'),
+    ('F', '31121123222112', 'O'),
+    ('Ne', '111213322112', 'F'),
+    ('Na', '123222112', 'Ne'),
+    ('Mg', '3113322112', 'Pm Na'),
+    ('Al', '1113222112', 'Mg'),
+    ('Si', '1322112', 'Al'),
+    ('P', '311311222112', 'Ho Si'),
+    ('S', '1113122112', 'P'),
+    ('Cl', '132112', 'S'),
+    ('Ar', '3112', 'Cl'),
+    ('K', '1112', 'Ar'),
+    ('Ca', '12', 'K'),
+    ('Sc', '3113112221133112', 'Ho Pa H Ca Co'),
+    ('Ti', '11131221131112', 'Sc'),
+    ('V', '13211312', 'Ti'),
+    ('Cr', '31132', 'V'),
+    ('Mn', '111311222112', 'Cr Si'),
+    ('Fe', '13122112', 'Mn'),
+    ('Co', '32112', 'Fe'),
+    ('Ni', '11133112', 'Zn Co'),
+    ('Cu', '131112', 'Ni'),
+    ('Zn', '312', 'Cu'),
+    ('Ga', '13221133122211332', 'Eu Ca Ac H Ca Zn'),
+    ('Ge', '31131122211311122113222', 'Ho Ga'),
+    ('As', '11131221131211322113322112', 'Ge Na'),
+    ('Se', '13211321222113222112', 'As'),
+    ('Br', '3113112211322112', 'Se'),
+    ('Kr', '11131221222112', 'Br'),
+    ('Rb', '1321122112', 'Kr'),
+    ('Sr', '3112112', 'Rb'),
+    ('Y', '1112133', 'Sr U'),
+    ('Zr', '12322211331222113112211', 'Y H Ca Tc'),
+    ('Nb', '1113122113322113111221131221', 'Er Zr'),
+    ('Mo', '13211322211312113211', 'Nb'),
+    ('Tc', '311322113212221', 'Mo'),
+    ('Ru', '132211331222113112211', 'Eu Ca Tc'),
+    ('Rh', '311311222113111221131221', 'Ho Ru'),
+    ('Pd', '111312211312113211', 'Rh'),
+    ('Ag', '132113212221', 'Pd'),
+    ('Cd', '3113112211', 'Ag'),
+    ('In', '11131221', 'Cd'),
+    ('Sn', '13211', 'In'),
+    ('Sb', '3112221', 'Pm Sn'),
+    ('Te', '1322113312211', 'Eu Ca Sb'),
+    ('I', '311311222113111221', 'Ho Te'),
+    ('Xe', '11131221131211', 'I'),
+    ('Cs', '13211321', 'Xe'),
+    ('Ba', '311311', 'Cs'),
+    ('La', '11131', 'Ba'),
+    ('Ce', '1321133112', 'La H Ca Co'),
+    ('Pr', '31131112', 'Ce'),
+    ('Nd', '111312', 'Pr'),
+    ('Pm', '132', 'Nd'),
+    ('Sm', '311332', 'Pm Ca Zn'),
+    ('Eu', '1113222', 'Sm'),
+    ('Gd', '13221133112', 'Eu Ca Co'),
+    ('Tb', '3113112221131112', 'Ho Gd'),
+    ('Dy', '111312211312', 'Tb'),
+    ('Ho', '1321132', 'Dy'),
+    ('Er', '311311222', 'Ho Pm'),
+    ('Tm', '11131221133112', 'Er Ca Co'),
+    ('Yb', '1321131112', 'Tm'),
+    ('Lu', '311312', 'Yb'),
+    ('Hf', '11132', 'Lu'),
+    ('Ta', '13112221133211322112211213322113', 'Hf Pa H Ca W'),
+    ('W', '312211322212221121123222113', 'Ta'),
+    ('Re', '111312211312113221133211322112211213322113', 'Ge Ca W'),
+    ('Os', '1321132122211322212221121123222113', 'Re'),
+    ('Ir', '3113112211322112211213322113', 'Os'),
+    ('Pt', '111312212221121123222113', 'Ir'),
+    ('Au', '132112211213322113', 'Pt'),
+    ('Hg', '31121123222113', 'Au'),
+    ('Tl', '111213322113', 'Hg'),
+    ('Pb', '123222113', 'Tl'),
+    ('Bi', '3113322113', 'Pm Pb'),
+    ('Po', '1113222113', 'Bi'),
+    ('At', '1322113', 'Po'),
+    ('Rn', '311311222113', 'Ho At'),
+    ('Fr', '1113122113', 'Rn'),
+    ('Ra', '132113', 'Fr'),
+    ('Ac', '3113', 'Ra'),
+    ('Th', '1113', 'Ac'),
+    ('Pa', '13', 'Th'),
+    ('U', '3', 'Pa'),
+)
+
+ELEMENTS = {name: digits for name, digits, _ in PERIODIC_TABLE}
+DECAYS = {name: tuple(products.split()) for name, _, products in PERIODIC_TABLE}
+
+# Every element's decay has to spell out its next term
+assert all(play_game(ELEMENTS[name], 1) == ''.join(ELEMENTS[p] for p in DECAYS[name]) for name in ELEMENTS)
+
+# By Conway's Cosmological Theorem a number made of the digits 1-3 is a compound of these
+# elements within 24 iterations (22 is hydrogen from the start)
+MAX_ATOMIZE_ITERATIONS = 24
+
+# How much of the right hand side of a boundary is followed when checking it holds
+BOUNDARY_PREFIX_LENGTH = 64
+
+
+def boundary_holds(left_digit, right, iterations):
+    """
+    Whether a number ending in left_digit followed by right evolves as the two parts separately for
+    the given number of iterations. Look-and-say always keeps the last digit, so that's the case as
+    long as none of right's next terms start with left_digit. Only a prefix of right is followed,
+    dropping the last run of each term in case it carries on past the end of the prefix, so the
+    answer is exact whenever it says True. If the prefix runs out it says False to be safe.
+    """
+    prefix, exact = right[:BOUNDARY_PREFIX_LENGTH], len(right) <= BOUNDARY_PREFIX_LENGTH
+    for _ in range(iterations):
+        if not prefix or prefix[0] == left_digit:
+            return False
+        prefix = play_game(prefix, 1)
+        if not exact:
+            prefix = prefix[:-2]
+        if len(prefix) > BOUNDARY_PREFIX_LENGTH:
+            prefix, exact = prefix[:BOUNDARY_PREFIX_LENGTH], False
+    return True
+
+
+def parse_compound(number, iterations):
+    """
+    Split number into a list of element names, or return None if it isn't a compound of elements.
+    Two neighbouring element strings only behave as separate elements if their boundary holds, e.g.
+    312 is zinc rather than uranium followed by calcium, since 12 becomes 1112 and then 3112 which
+    runs into the 3. Boundaries are checked for the given number of iterations.
+    """
+    parses = [None] * (len(number) + 1)
+    parses[0] = []
+    for end in range(1, len(number) + 1):
+        for name, digits in ELEMENTS.items():
+            start = end - len(digits)
+            if start < 0 or parses[start] is None or number[start:end] != digits:
+                continue
+            if start > 0 and not boundary_holds(number[start - 1], number[start:], iterations + 1):
+                continue
+            parses[end] = parses[start] + [name]
+            break
+    return parses[-1]
+
+
+def atomize(starting_number, iterations):
+    """
+    Play the game digit by digit until the number is a compound of elements, or the iterations run
+    out. Returns the number, its elements (None if it isn't a compound yet) and the iterations left.
+    """
+    number = starting_number
+    elements = parse_compound(number, iterations)
+    for _ in range(min(iterations, MAX_ATOMIZE_ITERATIONS)):
+        if elements is not None:
+            break
+        number = play_game(number, 1)
+        iterations -= 1
+        elements = parse_compound(number, iterations)
+    if elements is None and iterations > 0:
+        raise ValueError('{:} does not atomize into the common elements'.format(starting_number))
+    return number, elements, iterations
+
+
+def element_counts(elements, iterations):
+    counts = Counter(elements)
+    for _ in range(iterations):
+        next_counts = Counter()
+        for element, count in counts.items():
+            for product in DECAYS[element]:
+                next_counts[product] += count
+        counts = next_counts
+    return counts
+
+
+def sequence_length(starting_number, iterations):
+    number, elements, iterations = atomize(starting_number, iterations)
+    if elements is None:
+        return len(number)
+    return sum(len(ELEMENTS[element]) * count for element, count in element_counts(elements, iterations).items())
+
+
 sample_input = '1'
 assert play_game(sample_input, 5) == '312211'
+assert ''.join(look_and_say_stream(sample_input, 5)) == '312211'
+assert sequence_length(sample_input, 5) == 6
+assert sequence_length(sample_input, 40) == len(play_game(sample_input, 40))
+assert sequence_length('312', 3) == len(play_game('312', 3)) == 8
+assert sequence_length('2313', 7) == len(play_game('2313', 7)) == 46
+
+rng = random.Random(2015)
+for _ in range(200):
+    seed = ''.join(rng.choice('123') for _ in range(rng.randint(1, 8)))
+    n = rng.randint(1, 16)
+    assert sequence_length(seed, n) == len(play_game(seed, n)), (seed, n)
 
 puzzle_input = '1113122113'
-print('Part 1:', len(play_game(puzzle_input, 40)))
-# Didn't do anything to optimize, it just takes a few mins to run
-# Might be fun to play with "atomizing" the sequence so it goes faster, as Conway describes
-# https://www.youtube.com/watch?v=ea7lJkEhytA
-print('Part 2:', len(play_game(puzzle_input, 50)))
+assert sequence_length(puzzle_input, 25) == len(play_game(puzzle_input, 25))
+print('Part 1:', sequence_length(puzzle_input, 40))
+print('Part 2:', sequence_length(puzzle_input, 50))
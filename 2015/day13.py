@@ -2,8 +2,8 @@
 # Michael Bell
 # 1/10/2021
 
-import itertools
 from collections import defaultdict
+from hamiltonian import hamiltonian_cycle
 import helper
 
 
@@ -30,20 +30,15 @@ def parse_puzzle_input(puzzle_input):
 
 
 def optimal_happiness(happiness_ratings):
-
     people = list(happiness_ratings.keys())
 
-    highest_score = 0
-
-    for perm in itertools.permutations(people):
-        score = 0
-        candidate_order = list(perm)
-        for l_neighbor, person, r_neighbor in zip([candidate_order[-1]] + candidate_order[:-1], candidate_order, candidate_order[1:] + [candidate_order[0]]):
-            score += happiness_ratings[person][l_neighbor] + happiness_ratings[person][r_neighbor]
-        if score > highest_score:
-            highest_score = score
-    
-    return highest_score
+    # Sitting next to each other counts for both people, so the table is a round trip over the pairwise totals
+    pair_happiness = [
+        [0 if person == neighbor else happiness_ratings[person][neighbor] + happiness_ratings[neighbor][person] for neighbor in people]
+        for person in people
+    ]
+
+    return hamiltonian_cycle(pair_happiness, longest=True)
 
 
 example_input = '''Alice would gain 54 happiness units by sitting next to Bob.
@@ -0,0 +1,64 @@
+# Shortest/longest Hamiltonian paths and cycles by bitmask dynamic programming (Held-Karp), shared by
+# the route planning style puzzles. Nodes are 0..n-1 and weights[a][b] is the cost of going from a to b.
+# O(n^2 2^n) instead of trying all n! orderings.
+from typing import List, Sequence
+
+INFINITY = float('inf')
+
+
+def _cheapest_paths(weights: Sequence[Sequence[int]], starts: Sequence[int]) -> List[List[float]]:
+    """
+    Cheapest cost of every path that leaves from one of starts, visits exactly the nodes in mask and ends at
+    node last, indexed as [mask][last].
+    """
+    n = len(weights)
+    cost = [[INFINITY] * n for _ in range(1 << n)]
+    for start in starts:
+        cost[1 << start][start] = 0
+
+    for mask in range(1, 1 << n):
+        row = cost[mask]
+        for last in range(n):
+            so_far = row[last]
+            if so_far == INFINITY:
+                continue
+            from_last = weights[last]
+            for node in range(n):
+                bit = 1 << node
+                if mask & bit:
+                    continue
+                candidate = so_far + from_last[node]
+                if candidate < cost[mask | bit][node]:
+                    cost[mask | bit][node] = candidate
+    return cost
+
+
+def _signed(weights: Sequence[Sequence[int]], longest: bool) -> Sequence[Sequence[int]]:
+    # The longest route is the shortest one with every weight negated
+    return [[-w for w in row] for row in weights] if longest else weights
+
+
+def hamiltonian_path(weights: Sequence[Sequence[int]], longest: bool=False) -> int:
+    """
+    Cost of the shortest (or longest) route visiting every node once, starting and ending anywhere.
+    """
+    n = len(weights)
+    if n == 0:
+        raise ValueError('Need at least one node')
+    cost = _cheapest_paths(_signed(weights, longest), range(n))
+    best = min(cost[(1 << n) - 1])
+    return -best if longest else best
+
+
+def hamiltonian_cycle(weights: Sequence[Sequence[int]], longest: bool=False) -> int:
+    """
+    Cost of the shortest (or longest) round trip visiting every node once. Every cycle passes through
+    node 0, so only paths starting there need to be considered.
+    """
+    n = len(weights)
+    if n == 0:
+        raise ValueError('Need at least one node')
+    signed = _signed(weights, longest)
+    cost = _cheapest_paths(signed, [0])
+    best = min(cost[(1 << n) - 1][last] + signed[last][0] for last in range(n))
+    return -best if longest else best
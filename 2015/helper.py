@@ -1,8 +1,15 @@
+import sys
+import os
+
+# Input loading is shared by every year, see aoc_input.py in the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aoc_input
+
+puzzle_year = int(os.path.basename(os.path.dirname(os.path.abspath(__file__))))
+
+
 def read_input(day_num):
-    with open('./inputs/day{:>02}.txt'.format(day_num), 'r') as f:
-        contents = f.read()
-    return contents
+    return aoc_input.read_raw_input(puzzle_year, day_num)
 
 def read_input_lines(day_num):
-    contents = read_input(day_num)
-    return [c for c in contents.split('\n') if c.strip()]
+    return aoc_input.read_input_lines(puzzle_year, day_num)
@@ -0,0 +1,264 @@
+"""
+Shared assembly VM for the 2017 Advent Of Code register machine puzzles (days 8, 18 and 23)
+Michael Bell
+
+Programs are compiled once into tuples with register indices and immediate values already
+resolved, instead of re-parsing the text of every instruction each time it executes.
+"""
+from collections import deque
+import operator
+
+
+SET, ADD, SUB, MUL, MOD, JGZ, JNZ, SND, RCV, SKIP_UNLESS = range(10)
+
+OPCODES = {
+    'set': SET, 'add': ADD, 'sub': SUB, 'mul': MUL, 'mod': MOD,
+    'jgz': JGZ, 'jnz': JNZ, 'snd': SND, 'rcv': RCV,
+}
+
+COMPARISONS = {
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt,
+    '<=': operator.le, '==': operator.eq, '!=': operator.ne,
+}
+
+# Reasons run() returns
+HALTED = 0   # Jumped outside the program
+STOPPED = 1  # The receive handler couldn't carry on, e.g. nothing to receive
+PAUSED = 2   # Ran max_steps instructions
+
+
+def register_index(name, register_names):
+    if name not in register_names:
+        register_names.append(name)
+    return register_names.index(name)
+
+
+def operand(token, register_names):
+    """
+    Returns (value, True) for a register, where value is its index, and (value, False) for a number
+    """
+    try:
+        return int(token), False
+    except ValueError:
+        return register_index(token, register_names), True
+
+
+def compile_line(line, register_names):
+    """
+    Compile a line of source to a list of (opcode, x, x is a register, y, y is a register, comparison)
+    tuples. The day 8 style conditional increments ("b inc 5 if a > 1") become a SKIP_UNLESS that
+    jumps over the ADD that follows it.
+    """
+    tokens = line.split()
+
+    if tokens[1] in ('inc', 'dec') and len(tokens) == 7 and tokens[3] == 'if':
+        amount = int(tokens[2]) if tokens[1] == 'inc' else -int(tokens[2])
+        return [
+            (SKIP_UNLESS, register_index(tokens[4], register_names), True, int(tokens[6]), False, COMPARISONS[tokens[5]]),
+            (ADD, register_index(tokens[0], register_names), True, amount, False, None),
+        ]
+
+    if tokens[0] not in OPCODES:
+        raise ValueError('Unrecognized instruction: {:}'.format(line))
+    op = OPCODES[tokens[0]]
+
+    x, x_reg = operand(tokens[1], register_names)
+    if op in (SET, ADD, SUB, MUL, MOD, RCV) and not x_reg:
+        raise ValueError('{:} needs a register to write to: {:}'.format(tokens[0], line))
+    y, y_reg = operand(tokens[2], register_names) if len(tokens) > 2 else (0, False)
+
+    return [(op, x, x_reg, y, y_reg, None)]
+
+
+class AssemblyVM(object):
+    """
+    Runs a compiled program. snd and rcv are handed to the send and receive methods, which subclasses
+    override for the different puzzles. By default sent values are collected in outbox and received
+    values are taken from inbox.
+
+    The number of mul instructions executed is always kept in mul_count. With profile=True the number of
+    times each instruction executes is counted in counts, indexed by PC, which is handy for spotting the
+    hot loops worth working out by hand.
+    """
+
+    def __init__(self, program=None, register_names='abcdefghijklmnopqrstuvwxyz', profile=False):
+        self.register_names = list(register_names)
+        self.registers = [0] * len(self.register_names)
+        self.profile = profile
+        self.inbox = deque()
+        self.outbox = deque()
+        self.load(program if program is not None else [])
+
+    def load(self, program):
+        """
+        Compile the program and get ready to run it from the start. Registers are left as they are.
+        """
+        if isinstance(program, str):
+            program = program.replace('\r', '').strip().split('\n')
+
+        instructions = []
+        self.source = []
+        for line in program:
+            if len(line.strip()) == 0:
+                continue
+            compiled = compile_line(line, self.register_names)
+            instructions.extend(compiled)
+            self.source.extend([line] * len(compiled))
+        self.instructions = tuple(instructions)
+
+        # Compiling may have come across new register names
+        self.registers.extend([0] * (len(self.register_names) - len(self.registers)))
+        self.pc = 0
+        self.steps = 0
+        self.mul_count = 0
+        self.counts = [0] * len(self.instructions) if self.profile else None
+
+    def reg_index(self, reg):
+        return self.register_names.index(reg)
+
+    def get_register(self, reg):
+        return self.registers[self.reg_index(reg)]
+
+    def set_register(self, reg, val):
+        self.registers[self.reg_index(reg)] = val
+
+    def send(self, val):
+        self.outbox.append(val)
+
+    def receive(self, ndx):
+        """
+        Handle rcv for register index ndx. Returns False to stop before the rcv, it runs again next time.
+        """
+        if not self.inbox:
+            return False
+        self.registers[ndx] = self.inbox.popleft()
+        return True
+
+    def hot_spots(self, n=5):
+        """
+        The n most executed instructions as (count, pc, source) when profiling
+        """
+        if self.counts is None:
+            raise ValueError('Profiling is not enabled')
+        ranked = sorted(((count, pc, self.source[pc]) for pc, count in enumerate(self.counts)), reverse=True)
+        return ranked[:n]
+
+    def loops(self):
+        """
+        (start, end) PCs of every loop in the program, i.e. each jump back by a constant offset
+        """
+        return [
+            (pc + y, pc) for pc, (op, x, x_reg, y, y_reg, _) in enumerate(self.instructions)
+            if op in (JGZ, JNZ) and not y_reg and y < 0
+        ]
+
+    def run(self, max_steps=None):
+
+        instructions = self.instructions
+        registers = self.registers
+        counts = self.counts
+        n_instructions = len(instructions)
+        pc = self.pc
+        steps = 0
+        mul_count = 0
+
+        while True:
+            if pc < 0 or pc >= n_instructions:
+                status = HALTED
+                break
+            if steps == max_steps:
+                status = PAUSED
+                break
+
+            op, x, x_reg, y, y_reg, compare = instructions[pc]
+            if y_reg:
+                y = registers[y]
+
+            if op == SET:
+                registers[x] = y
+            elif op == ADD:
+                registers[x] += y
+            elif op == SUB:
+                registers[x] -= y
+            elif op == MUL:
+                registers[x] *= y
+                mul_count += 1
+            elif op == MOD:
+                registers[x] %= y
+            elif op == JNZ or op == JGZ or op == SKIP_UNLESS:
+                test_val = registers[x] if x_reg else x
+                if op == JNZ and test_val != 0 or op == JGZ and test_val > 0:
+                    jump = y
+                elif op == SKIP_UNLESS and not compare(test_val, y):
+                    jump = 2
+                else:
+                    jump = 1
+                if counts is not None:
+                    counts[pc] += 1
+                steps += 1
+                pc += jump
+                continue
+            elif op == SND:
+                self.send(registers[x] if x_reg else x)
+            elif op == RCV:
+                if not self.receive(x):
+                    status = STOPPED
+                    break
+
+            if counts is not None:
+                counts[pc] += 1
+            steps += 1
+            pc += 1
+
+        self.pc = pc
+        self.steps += steps
+        self.mul_count += mul_count
+        return status
+
+
+class Network(object):
+    """
+    Cooperative scheduler for any number of VMs passing values through their outboxes and inboxes, e.g.
+    day 18's duet. By default each VM sends to the next one round in a ring, connect() changes that.
+    run() takes turns in index order, letting each VM run until it blocks on rcv or halts and then
+    delivering what it sent, so the result is deterministic and a deadlock is spotted as soon as a
+    whole round goes by without any VM executing an instruction.
+    """
+
+    def __init__(self, vms):
+        self.vms = vms
+        self.destinations = [(index + 1) % len(vms) for index in range(len(vms))]
+        self.halted = [False] * len(vms)
+
+    def connect(self, source, destination):
+        self.destinations[source] = destination
+
+    def step(self, index):
+        """
+        Give VM index a turn. Returns True if it executed anything.
+        """
+        if self.halted[index]:
+            return False
+
+        vm = self.vms[index]
+        steps = vm.steps
+        if vm.run() == HALTED:
+            self.halted[index] = True
+
+        self.vms[self.destinations[index]].inbox.extend(vm.outbox)
+        vm.outbox.clear()
+
+        return vm.steps > steps
+
+    def run(self):
+        """
+        Run until every VM has halted (returns True) or they're all stuck waiting to receive
+        values nobody is going to send (returns False).
+        """
+        while not all(self.halted):
+            progress = False
+            for index in range(len(self.vms)):
+                progress = self.step(index) or progress
+            if not progress:
+                return False
+        return True
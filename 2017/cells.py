@@ -0,0 +1,91 @@
+"""
+Growable tapes and grids of small integer cells for the 2017 Advent Of Code automaton puzzles (days 22 and 25)
+Michael Bell
+
+Cells are kept in flat bytearrays/arrays that grow whenever the simulation walks off the edge,
+which is far quicker and smaller than hashing coordinates into sets or dicts.
+"""
+from array import array
+
+
+class Tape(object):
+    """
+    Tape that's unbounded in both directions. Position p is stored at cells[p + origin]. Cells are
+    bytes by default, any other array typecode can be used, e.g. 'Q' to pack 64 bits per cell.
+    """
+
+    def __init__(self, size=1024, typecode='B'):
+        self.typecode = typecode
+        self.cells = array(typecode, [0]) * size
+        self.origin = size // 2
+
+    def grow(self, index):
+        """
+        Double the tape towards the side index has run off, growing the array in place.
+        Returns the index of the same cell afterwards.
+        """
+        size = len(self.cells)
+        if index < 0:
+            self.cells[0:0] = array(self.typecode, [0]) * size
+            self.origin += size
+            return index + size
+        self.cells.extend(array(self.typecode, [0]) * size)
+        return index
+
+    def count(self, value):
+        return self.cells.count(value)
+
+
+class Grid(object):
+    """
+    Grid that's unbounded in every direction, stored row by row in a bytearray. The cell at (row, col)
+    is cells[index(row, col)], and moving by one row is a step of stride. The grid is framed by a
+    ring of EDGE cells, so a walker finds out it has left the grid from the cell it lands on
+    instead of checking bounds on every move.
+    """
+
+    EDGE = 255
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        self.cells = bytearray(self.stride * (height + 2))
+        self._frame()
+
+    def _frame(self):
+        stride, cells = self.stride, self.cells
+        cells[:stride] = bytes([self.EDGE]) * stride
+        cells[-stride:] = bytes([self.EDGE]) * stride
+        cells[::stride] = bytes([self.EDGE]) * (self.height + 2)
+        cells[stride - 1::stride] = bytes([self.EDGE]) * (self.height + 2)
+
+    def index(self, row, col):
+        return (row + 1) * self.stride + col + 1
+
+    def position(self, index):
+        row, col = divmod(index, self.stride)
+        return row - 1, col - 1
+
+    def grow(self, index):
+        """
+        Roughly double the grid each way, keeping the current cells in the middle. cells is a new
+        bytearray afterwards. Returns the new index of the cell at index, which may have been on
+        the edge.
+        """
+        row, col = self.position(index)
+        row_shift = self.height // 2 + 1
+        col_shift = self.width // 2 + 1
+
+        old_cells, old_stride, old_width, old_height = self.cells, self.stride, self.width, self.height
+        self.__init__(self.width + 2 * col_shift, self.height + 2 * row_shift)
+
+        for old_row in range(old_height):
+            start = self.index(old_row + row_shift, col_shift)
+            old_start = (old_row + 1) * old_stride + 1
+            self.cells[start:start + old_width] = old_cells[old_start:old_start + old_width]
+
+        return self.index(row + row_shift, col + col_shift)
+
+    def count(self, value):
+        return self.cells.count(value)
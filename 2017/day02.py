@@ -4,6 +4,8 @@
 # 12/9/2017
 # Solutions valid
 
+from helper import read_input
+
 
 def row_ratio(vals):
     for j, v in enumerate(vals):
@@ -43,8 +45,7 @@ test_input2 = """5 9 2 8
 9 4 7 3
 3 8 6 5"""
 
-with open('data/day02_input.txt', 'r') as f:
-    real_input = f.read()
+real_input = read_input(2)
 
 if __name__ == "__main__":
     
@@ -4,6 +4,8 @@
 # 12/11/2017
 # Solutions passed
 
+from helper import read_input
+
 
 def passphrase_is_valid(phrase, mode='basic'):
 
@@ -61,8 +63,7 @@ aa bb cc dd aaa"""
 
     print("All tests passed!")
 
-    with open('data/day04_input.txt', 'r') as f:
-        puzzle_input = f.read()
+    puzzle_input = read_input(4)
 
     strict_validator = lambda x: passphrase_is_valid(x, 'strict')
     print("Solution 1: {:}".format(count_valid_passphrases(puzzle_input)))
@@ -4,6 +4,8 @@
 # 12/12/2017
 # Solutions passed.
 
+from helper import read_input
+
 def count_steps_to_exit(puzzle, mode=None):
     """
     Takes a string of numbers separated by spaces as input PUZZLE.
@@ -45,8 +47,7 @@ if __name__ == "__main__":
 
     print("All tests passed!")
 
-    with open('data/day05_input.txt', 'r') as f:
-        puzzle_input = f.read().replace('\n', ' ')
+    puzzle_input = read_input(5).replace('\n', ' ')
 
     print("Solution 1: {:}".format(count_steps_to_exit(puzzle_input)))
     print("Solution 2: {:}".format(count_steps_to_exit(puzzle_input, 'complex')))
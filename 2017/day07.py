@@ -4,6 +4,8 @@
 # 12/13/2017
 # Solutions passed!
 
+from helper import read_input
+
 # NOTE: This is pretty sloppy. Might think about refactoring.
 
 class TreeNode(object):
@@ -137,8 +139,7 @@ ugml (68) -> gyxo, ebii, jptl
 gyxo (61)
 cntj (57)'''
 
-with open('data/day07_input.txt', 'r') as f:
-    puzzle_input = f.read()
+puzzle_input = read_input(7)
 
 if __name__ == '__main__':
     tree = build_tree(test_program_list)
@@ -4,6 +4,8 @@
 # 12/16/2017
 # Solutions passed!
 
+from helper import read_input
+
 def score_stream(stream):
     """
     Given a stream of groups (characters between {}), return the total score for the stream.
@@ -39,8 +41,7 @@ def score_stream(stream):
     return sum(group_scores), garbage_characters
 
 
-with open('data/day09_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read().replace('\r', '').replace('\n', '').strip()
+PUZZLE_INPUT = read_input(9).replace('\n', '').strip()
 
 
 if __name__ == '__main__':
@@ -5,35 +5,16 @@ Michael Bell
 12/16/2017
 Solutions passed
 """
-
-
-def get_subsequence_circular(seq, start, length):
-    """
-    Get a subsequence from a list, wrapping around the end of the list as necessary.
-    """
-    sub_seq = seq[start:start + length]
-    if start + length > len(seq):
-        sub_seq.extend(seq[:start + length - len(seq)])
-    return sub_seq
-
-
-def set_subsequence_circular(seq, sub_seq, start):
-    """
-    Set a subset of a list, wrapping around the end of the list as necessary.
-    """
-    seq_len = len(seq)
-    sub_seq_len = len(sub_seq)
-
-    seq[start:start + sub_seq_len] = sub_seq
-    if start + sub_seq_len > seq_len:
-        seq[:start + sub_seq_len - seq_len] = seq[seq_len:]
-    return seq[:seq_len]
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+import operator
 
 
 class KnotHash(object):
     def __init__(self, elements=256):
         if isinstance(elements, int):
-            self.seq = list(range(elements))
+            # Up to 256 elements fit in a bytearray, which can be reversed in place a slice at a time
+            self.seq = bytearray(range(elements)) if elements <= 256 else list(range(elements))
         else:
             self.seq = elements
         self.n_elements = len(self.seq)
@@ -47,34 +28,43 @@ class KnotHash(object):
         If elements is a list, use that as the list to shuffle.
         """
 
+        seq = self.seq
+        n_elements = self.n_elements
+
         for length in lengths:
 
-            if length > self.n_elements:
+            if length > n_elements:
                 raise ValueError(
                     "Lengths cannot be larger than the number of elements {:}!".format(
-                        self.n_elements
+                        n_elements
                     )
                 )
 
-            sub_seq = get_subsequence_circular(self.seq, self.current_position, length)
-            sub_seq = [val for val in sub_seq[::-1]]
-            self.seq = set_subsequence_circular(self.seq, sub_seq, self.current_position)
-
-            self.current_position += length + self.skip_size
-            self.current_position = self.current_position % self.n_elements
+            start = self.current_position
+            end = start + length
+            if end <= n_elements:
+                seq[start:end] = seq[start:end][::-1]
+            else:
+                # Wraps around the end, reverse the two pieces together then put them back
+                end -= n_elements
+                sub_seq = (seq[start:] + seq[:end])[::-1]
+                seq[start:] = sub_seq[:n_elements - start]
+                seq[:end] = sub_seq[n_elements - start:]
+
+            self.current_position = (start + length + self.skip_size) % n_elements
             self.skip_size += 1
 
     def check_sequence(self):
         return self.seq[0] * self.seq[1]
 
+    def digest(self):
+        """
+        The dense hash as raw bytes.
+        """
+        return bytes(reduce(operator.xor, self.seq[i:i + 16]) for i in range(0, self.n_elements, 16))
+
     def dense_hash(self):
-        dense_hash = []
-        for i in range(0, self.n_elements, 16):
-            hash_val = 0
-            for val in self.seq[i:i+16]:
-                hash_val = hash_val ^ val
-            dense_hash.append(str(hex(hash_val).replace('0x', '')).zfill(2))
-        return ''.join(dense_hash)
+        return self.digest().hex()
 
 
 def string_to_bytes(input):
@@ -85,7 +75,7 @@ def string_to_list(input):
     return [int(val) for val in input.split(',')]
 
 
-def full_knot_hash(input, niter=64, elements=256):
+def knot_hash_digest(input, niter=64, elements=256):
 
     lengths = string_to_bytes(input) + EXTRA_LENGTHS
 
@@ -94,7 +84,22 @@ def full_knot_hash(input, niter=64, elements=256):
     for _ in range(niter):
         knots.tie_knots(lengths)
 
-    return knots.dense_hash()
+    return knots.digest()
+
+
+def full_knot_hash(input, niter=64, elements=256):
+
+    return knot_hash_digest(input, niter, elements).hex()
+
+
+def knot_hash_digests(inputs, jobs=1):
+    """
+    Digests for a batch of inputs, hashed across a process pool if jobs > 1.
+    """
+    if jobs <= 1:
+        return [knot_hash_digest(input) for input in inputs]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(knot_hash_digest, inputs, chunksize=len(inputs) // jobs + 1))
 
 
 PUZZLE_INPUTS = "192,69,168,160,78,1,166,28,0,83,198,2,254,255,41,12"
@@ -103,9 +108,6 @@ EXTRA_LENGTHS = [17, 31, 73, 47, 23]
 
 if __name__ == '__main__':
     # TESTS
-    assert get_subsequence_circular([1, 2, 3, 4, 5], 1, 3) == [2, 3, 4]
-    assert get_subsequence_circular([1, 2, 3, 4, 5], 3, 3) == [4, 5, 1]
-    assert set_subsequence_circular([1, 2, 3, 4, 5], [10, 11, 12], 3) == [12, 2, 3, 10, 11]
 
     test_knots = KnotHash(5)
     test_knots.tie_knots([3, 4, 1, 5])
@@ -117,6 +119,11 @@ if __name__ == '__main__':
     assert full_knot_hash('AoC 2017') == '33efeb34ea91902bb2f59c9920caa6cd'
     assert full_knot_hash('1,2,3') == '3efbe78a8d82f29979031a4aa0b16a9d'
     assert full_knot_hash('1,2,4') == '63960835bcdc130f0b66d7ff4f6a5a8e'
+    assert knot_hash_digests(['', '1,2,3'], jobs=2) == [bytes.fromhex('a2582a3a0e66e6e86e3812dcb672a272'), bytes.fromhex('3efbe78a8d82f29979031a4aa0b16a9d')]
+
+    test_knots = KnotHash(list(range(5)))
+    test_knots.tie_knots([3, 4, 1, 5])
+    assert test_knots.seq == [3, 4, 2, 1, 0]
 
     print("All tests passed!")
    
@@ -5,6 +5,7 @@ Michael Bell
 12/16/2017
 Solutions passed
 """
+from helper import read_input
 
 
 def parse_steps(steps):
@@ -167,8 +168,7 @@ def max_distance_from_start(steps):
 
     return max_dist
 
-with open('data/day11_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read()
+PUZZLE_INPUT = read_input(11)
 
 
 if __name__ == '__main__':
@@ -5,6 +5,7 @@ Michael Bell
 12/17/2017
 Solutions passed
 """
+from helper import read_input
 
 class Node(object):
     """
@@ -133,8 +134,7 @@ TEST_LISTING = """0 <-> 2
 5 <-> 6
 6 <-> 4, 5"""
 
-with open('data/day12_input.txt', 'r') as f:
-    PUZZLE_LISTING = f.read()
+PUZZLE_LISTING = read_input(12)
 
 if __name__ == '__main__':
     # TESTS
@@ -8,6 +8,8 @@ Solutions passed
 
 from collections import defaultdict
 from itertools import count
+from math import gcd
+from helper import read_input
 
 
 def parse_layers(layers):
@@ -75,52 +77,85 @@ def hit_test(pos, rng):
         return 0
 
 
-def score_run(firewall_layers, delay=0, score_function=None, break_when_hit=False):
+def scanner_period(layer_range):
+    # Down and back up again, a scanner with a range of 1 never leaves the top
+    return max(2 * (layer_range - 1), 1)
+
 
+def scanners(firewall_layers):
+    """
+    (depth, range, period, phase) of every layer that has a scanner, where phase is how many
+    steps it is through its period. A scanner is at the top whenever phase + time is a multiple
+    of its period, so the packet is caught at a layer when phase + delay + depth is.
+    """
     if isinstance(firewall_layers, Firewall):
-        firewall = firewall_layers
-    else:
-        firewall = Firewall(firewall_layers)
+        layer_scanners = []
+        for depth, layer in enumerate(firewall_layers.layers):
+            if layer.layer_range > 0:
+                period = scanner_period(layer.layer_range)
+                position = layer.scanner_position
+                phase = position if layer.direction > 0 else (period - position) % period
+                layer_scanners.append((depth, layer.layer_range, period, phase))
+        return layer_scanners
 
-    if score_function is None:
-        score_function = default_score
+    return [
+        (depth, layer_range, scanner_period(layer_range), 0)
+        for depth, layer_range in sorted(parse_layers(firewall_layers).items()) if layer_range > 0
+    ]
 
-    packet_position = -delay - 1
-    score = 0
 
-    while packet_position < len(firewall.layers) - 1:
-        packet_position += 1
+def score_run(firewall_layers, delay=0, score_function=None, break_when_hit=False):
+    """
+    Score a packet sent after delay steps. delay can also be a range of delays, which are all
+    scored at once and returned as a list: each scanner catches an evenly spaced subset of them,
+    so the work is per scanner rather than per delay.
+    """
+    if score_function is None:
+        score_function = default_score
 
-        if packet_position >= 0:
-            layer = firewall.layers[packet_position]
-        else:
-            layer = None
-        
-        if layer is not None and layer.scanner_position == 0 and layer.layer_range > 0:
-            score += score_function(packet_position, layer.layer_range)
-            if break_when_hit:
+    layer_scanners = scanners(firewall_layers)
+
+    if isinstance(delay, int):
+        score = 0
+        for depth, layer_range, period, phase in layer_scanners:
+            if (phase + delay + depth) % period == 0:
+                score += score_function(depth, layer_range)
+                if break_when_hit:
+                    break
+        return score
+
+    delays = delay
+    scores = [0] * len(delays)
+
+    # Deepest first, so with break_when_hit the shallowest scanner that catches a packet has the last word
+    for depth, layer_range, period, phase in reversed(layer_scanners):
+        score = score_function(depth, layer_range)
+        stride = period // gcd(delays.step, period)
+        for first in range(min(stride, len(delays))):
+            if (phase + delays[first] + depth) % period == 0:
+                for i in range(first, len(delays), stride):
+                    scores[i] = score if break_when_hit else scores[i] + score
                 break
-        
-        firewall.increment_time()
-
-    return score
-
-
-def find_delay(firewall_layers):
-
-    firewall = Firewall(firewall_layers)
 
-    for delay in count():
+    return scores
 
-        if score_run(firewall.copy(), score_function=hit_test, break_when_hit=True) == 0:
-            break
 
-        firewall.increment_time()
+def find_delay(firewall_layers, block_size=1000000):
+    """
+    Sieve out the delays where some scanner catches the packet a block of delays at a time: those
+    for a scanner are every period-th delay, so each gets marked with one slice assignment.
+    """
+    layer_scanners = scanners(firewall_layers)
 
-        if (delay + 1) % 10000 == 0:
-            print(delay + 1)
+    for start in count(0, block_size):
+        caught = bytearray(block_size)
+        for depth, layer_range, period, phase in layer_scanners:
+            first = (-phase - depth - start) % period
+            caught[first::period] = b'\x01' * len(range(first, block_size, period))
 
-    return delay
+        safe = caught.find(0)
+        if safe >= 0:
+            return start + safe
 
 
 TEST_INPUT = """0: 3
@@ -128,8 +163,7 @@ TEST_INPUT = """0: 3
 4: 4
 6: 4"""
 
-with open('data/day13_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read()
+PUZZLE_INPUT = read_input(13)
 
 
 if __name__ == '__main__':
@@ -140,6 +174,10 @@ if __name__ == '__main__':
         test_firewall.increment_time()
     assert score_run(test_firewall) == 0
     assert find_delay(TEST_INPUT) == 10
+    assert find_delay(TEST_INPUT, block_size=3) == 10
+    assert score_run(TEST_INPUT, range(12)) == [score_run(TEST_INPUT, delay) for delay in range(12)]
+    assert score_run(TEST_INPUT, range(12), hit_test, True) == [1] * 10 + [0, 1]
+    assert score_run(TEST_INPUT, range(1, 12, 3), hit_test, True) == [1, 1, 1, 0]
     print('All tests passed!')
     print('Solution 1: {:}'.format(score_run(PUZZLE_INPUT)))
     print('Solution 2: {:}'.format(find_delay(PUZZLE_INPUT)))
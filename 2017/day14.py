@@ -6,85 +6,69 @@ Michael Bell
 Solutions passed
 """
 
-import day10 as knot_hash
-import day12 as graph
-
-
-def hex_char_to_bin(hex_char):
-    if hex_char.isdigit():
-        int_rep = int(hex_char)
-    else:
-        alpha_vals = ['a', 'b', 'c', 'd', 'e', 'f']
-        int_rep = int(10 + alpha_vals.index(hex_char))
-    
-    return bin(int_rep).replace('0b', '').zfill(4)
+import os
 
+import day10 as knot_hash
 
-def hex_to_bin(hex_string):
-    bin_string = ''
-    for char in hex_string:
-        bin_string += hex_char_to_bin(char)
-    return bin_string
 
+GRID_SIZE = 128
 
-def count_used_squares(key):
 
-    used_square_count = 0
+def grid_rows(key, jobs=1):
+    """
+    Each row of the grid as a 128 bit integer, the most significant bit being the leftmost square.
+    """
+    digests = knot_hash.knot_hash_digests(["{:}-{:}".format(key, i) for i in range(GRID_SIZE)], jobs)
+    return [int.from_bytes(digest, 'big') for digest in digests]
 
-    for i in range(128):
-        hash_code = knot_hash.full_knot_hash("{:}-{:}".format(key, str(i)))
-        bin_code = hex_to_bin(hash_code)
 
-        used_square_count += sum(1 for square in bin_code if square == '1')
-    
-    return used_square_count
+def count_used_squares(key, jobs=1):
 
+    return sum(row.bit_count() for row in grid_rows(key, jobs))
 
-def cell_to_index(row, col, ncol=128):
-    return row * ncol + col
 
+def set_bits(row):
+    while row:
+        low_bit = row & -row
+        yield low_bit.bit_length() - 1
+        row ^= low_bit
 
-def get_connections(grid):
 
-    node_listings = []
-    for row_num, row in enumerate(grid):
-        for col_num, val in enumerate(row):
-            if val == '1':
-                pid = cell_to_index(row_num, col_num)
+def count_regions(rows):
+    """
+    Union-find over the used squares, joining each one to its used neighbours in the next bit and
+    the next row. Every successful join merges two regions into one. Square (row, col) is
+    row * GRID_SIZE + col, col counting from the least significant bit.
+    """
+    parent = list(range(len(rows) * GRID_SIZE))
 
-                connections = []
+    def find(square):
+        while parent[square] != square:
+            parent[square] = parent[parent[square]]
+            square = parent[square]
+        return square
 
-                if row_num > 0 and grid[row_num - 1][col_num] == '1':
-                    connections.append(cell_to_index(row_num - 1, col_num))
-                if row_num < len(grid) - 1 and grid[row_num + 1][col_num] == '1':
-                    connections.append(cell_to_index(row_num + 1, col_num))
-                if col_num > 0 and grid[row_num][col_num - 1] == '1':
-                    connections.append(cell_to_index(row_num, col_num - 1))
-                if col_num < len(row) - 1 and grid[row_num][col_num + 1] == '1':
-                    connections.append(cell_to_index(row_num, col_num + 1))
-                
-                if len(connections) == 0:
-                    connections.append(pid)
-            
-                node_listings.append(graph.encode_node_listing(pid, connections))
+    n_regions = sum(row.bit_count() for row in rows)
 
-    return '\n'.join(node_listings)
+    for row_num, row in enumerate(rows):
+        # Used squares whose neighbour one bit down or one row down is used too
+        joined_right = row & (row >> 1)
+        joined_below = row & rows[row_num + 1] if row_num + 1 < len(rows) else 0
 
+        for joined, step in ((joined_right, 1), (joined_below, GRID_SIZE)):
+            for col in set_bits(joined):
+                square = row_num * GRID_SIZE + col
+                a, b = find(square), find(square + step)
+                if a != b:
+                    parent[a] = b
+                    n_regions -= 1
 
-def count_groups(key):
-    grid = []
+    return n_regions
 
-    for i in range(128):
-        hash_code = knot_hash.full_knot_hash("{:}-{:}".format(key, str(i)))
-        bin_code = hex_to_bin(hash_code)
-        grid.append(bin_code)
 
-    node_listings = get_connections(grid)
+def count_groups(key, jobs=1):
 
-    node_graph = graph.Graph()
-    node_graph.build_graph(node_listings)
-        
-    return len(node_graph.get_groups())
+    return count_regions(grid_rows(key, jobs))
 
 
 TEST_INPUT = 'flqrgnkx'
@@ -92,8 +76,12 @@ PUZZLE_INPUT = 'hfdlxzhv'
 
 if __name__ == '__main__':
     
-    assert count_used_squares(TEST_INPUT) == 8108
+    jobs = os.cpu_count() or 1
+
+    assert count_used_squares(TEST_INPUT, jobs) == 8108
+    assert count_groups(TEST_INPUT, jobs) == 1242
+    assert count_regions([0b110, 0b011, 0b100]) == 2
     print("All tests passed!")
 
-    print('Solution 1: {:}'.format(count_used_squares(PUZZLE_INPUT)))
-    print('Solution 2: {:}'.format(count_groups(PUZZLE_INPUT)))
+    print('Solution 1: {:}'.format(count_used_squares(PUZZLE_INPUT, jobs)))
+    print('Solution 2: {:}'.format(count_groups(PUZZLE_INPUT, jobs)))
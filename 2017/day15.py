@@ -5,87 +5,157 @@ Michael Bell
 12/20/2017
 Solutions passed
 """
-
-
-def num_to_bin(num):
-
-    return bin(num).replace('0b', '').zfill(32)
-
-
-def bitwise_match(a_val, b_val):
-
-    a_bin = num_to_bin(a_val)
-    b_bin = num_to_bin(b_val)
-
-    return a_bin[-16:] == b_bin[-16:]
-
-
-class Generator(object):
-
-    def __init__(self, factor, starting_value):
-        self.value = starting_value
-        self.factor = factor
-        self.div = 2147483647
-        self.counter = 0
-
-    def next_value(self):
-
-        self.value = (self.value * self.factor) % self.div
-        self.counter += 1
-
-    def get_valid_values(self, criteria):
-        
-        while True:
-            self.next_value()
-            if self.value % criteria == 0:
-                yield self.value
-
-
-def count_valid_matching_pairs(a_init, b_init, N):
-
-    genA = Generator(16807, a_init)
-    genB = Generator(48271, b_init)
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+import os
+
+
+DIVISOR = 2147483647
+FACTOR_A = 16807
+FACTOR_B = 48271
+LOW_16 = 0xFFFF
+
+# Values are generated a row of up to LANES steps at a time, each step in its own 64 bit lane of one
+# big int, so a whole row moves on with a handful of big int operations instead of a Python loop
+LANES = 4096
+LANE_BITS = 64
+LANE_BYTES = LANE_BITS // 8
+ONES = sum(1 << (LANE_BITS * i) for i in range(LANES))
+LOW_31 = DIVISOR * ONES
+
+# Most generator steps handed to a worker at a time
+BLOCK_SIZE = 256 * LANES
+
+
+def jump(value, factor, steps):
+    """
+    The generator's value after the given number of steps, without stepping through them
+    """
+    return value * pow(factor, steps, DIVISOR) % DIVISOR
+
+
+def first_row(value, factor, n):
+    """
+    The n values following the given value, packed into lanes with the earliest in the lowest lane
+    """
+    packed = bytearray()
+    for _ in range(n):
+        value = value * factor % DIVISOR
+        packed += value.to_bytes(LANE_BYTES, 'little')
+    return int.from_bytes(packed, 'little')
+
+
+def next_row(row, multiplier):
+    """
+    Move every lane on by the same number of steps, where multiplier is factor to that power. Lanes
+    are below 2**31 so their products fit in 62 bits, and since the divisor is 2**31 - 1 each lane
+    can be reduced by adding its top bits to its bottom 31 bits, twice, without any carries.
+    """
+    row *= multiplier
+    row = (row & LOW_31) + (row >> 31 & LOW_31)
+    return (row & LOW_31) + (row >> 31 & ONES)
+
+
+def count_block_matches(args):
+    """
+    Number of matching pairs in the n steps following the given generator values
+    """
+    a_val, b_val, n = args
+    width = min(LANES, n)
+    a_row, b_row = first_row(a_val, FACTOR_A, width), first_row(b_val, FACTOR_B, width)
+    a_multiplier, b_multiplier = pow(FACTOR_A, width, DIVISOR), pow(FACTOR_B, width, DIVISOR)
+    low_16 = LOW_16 * ONES
 
     n_matches = 0
-
-    for i, (aval, bval) in enumerate(zip(genA.get_valid_values(4), genB.get_valid_values(8))):
-
-        if bitwise_match(aval, bval):
-            n_matches += 1
-
-        if (i + 1) % 100000 == 0:
-            print(i+1)
-
-        if i >= N:
-            break
-    
+    for start in range(0, n, width):
+        differences = (a_row ^ b_row) & low_16
+        # Adding 0xFFFF carries into bit 16 of every lane that differs
+        n_differing = ((differences + low_16) >> 16 & ONES).bit_count()
+        if n - start < width:
+            # Only the first few lanes of the last row are wanted
+            n_differing -= ((differences + low_16) >> (16 + LANE_BITS * (n - start)) & ONES).bit_count()
+        n_matches += min(width, n - start) - n_differing
+        a_row, b_row = next_row(a_row, a_multiplier), next_row(b_row, b_multiplier)
     return n_matches
 
 
-def count_matching_pairs(a_init, b_init, N):
-
-    genA = Generator(16807, a_init)
-    genB = Generator(48271, b_init)
-
-    n_matches = 0
-
-    for i in range(N):
-        genA.next_value()
-        genB.next_value()
-
-        if bitwise_match(genA.value, genB.value):
-            n_matches += 1
-
-        if (i + 1) % 1000000 == 0:
-            print(i+1)
-    
-    return n_matches
+def valid_block(args):
+    """
+    Low 16 bits of every value meeting the criteria (a power of two up to 256) in the n steps
+    following the given value
+    """
+    factor, value, n, criteria = args
+    if criteria & (criteria - 1) or criteria > 256:
+        raise ValueError('Criteria must be a power of two up to 256, not {:}'.format(criteria))
+    width = min(LANES, n)
+    row = first_row(value, factor, width)
+    multiplier = pow(factor, width, DIVISOR)
+    # Whether a value meets the criteria only depends on its lowest byte
+    is_valid = bytes(int(byte % criteria == 0) for byte in range(256))
+
+    values = []
+    for start in range(0, n, width):
+        lanes = min(width, n - start)
+        packed = row.to_bytes(width * LANE_BYTES, 'little')
+        valid = packed[:lanes * LANE_BYTES:LANE_BYTES].translate(is_valid)
+        values.extend(compress(array('H', packed)[:lanes * 4:4], valid))
+        row = next_row(row, multiplier)
+    return array('H', values)
+
+
+def _map(function, tasks, jobs):
+    if jobs <= 1:
+        return list(map(function, tasks))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(function, tasks))
+
+
+def count_matching_pairs(a_init, b_init, N, jobs=1):
+
+    # Every block starts from values jumped straight to its first step, so they're independent
+    tasks = [
+        (jump(a_init, FACTOR_A, start), jump(b_init, FACTOR_B, start), min(BLOCK_SIZE, N - start))
+        for start in range(0, N, BLOCK_SIZE)
+    ]
+    return sum(_map(count_block_matches, tasks, jobs))
+
+
+def valid_values(factor, init, criteria, N, jobs=1):
+    """
+    Low 16 bits of the first N values meeting the criteria, generated a round of blocks at a time
+    """
+    values = array('H')
+    start = 0
+    while len(values) < N:
+        # Roughly 1 in criteria values are valid, ask for a row's worth more so one round is usually enough
+        needed = (N - len(values) + LANES) * criteria
+        size = min(BLOCK_SIZE, -(-needed // max(jobs, 1)))
+        n_blocks = -(-needed // size)
+        tasks = [(factor, jump(init, factor, start + i * size), size, criteria) for i in range(n_blocks)]
+        for block in _map(valid_block, tasks, jobs):
+            values.extend(block)
+        start += n_blocks * size
+    return values[:N]
+
+
+def count_valid_matching_pairs(a_init, b_init, N, jobs=1):
+
+    a_values = valid_values(FACTOR_A, a_init, 4, N, jobs)
+    b_values = valid_values(FACTOR_B, b_init, 8, N, jobs)
+
+    differences = int.from_bytes(a_values.tobytes(), 'little') ^ int.from_bytes(b_values.tobytes(), 'little')
+    return array('H', differences.to_bytes(2 * N, 'little')).count(0)
 
 
 if __name__ == '__main__':
 
+    jobs = os.cpu_count() or 1
+
     assert count_matching_pairs(65, 8921, 5) == 1
+    assert count_matching_pairs(65, 8921, 5000) == 1
+    assert count_valid_matching_pairs(65, 8921, 1055) == 0
     assert count_valid_matching_pairs(65, 8921, 1056) == 1
     print('Tests passed!')
-    print('Solution 1: {:}'.format(count_matching_pairs(722, 354, 40000000)))
-    print('Solution 2: {:}'.format(count_valid_matching_pairs(722, 354, 5000000)))
+    print('Solution 1: {:}'.format(count_matching_pairs(722, 354, 40000000, jobs)))
+    print('Solution 2: {:}'.format(count_valid_matching_pairs(722, 354, 5000000, jobs)))
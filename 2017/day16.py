@@ -5,6 +5,7 @@ Michael Bell
 12/21/2017
 Solutions passed
 """
+from helper import read_input
 
 
 def spin(group, n):
@@ -46,49 +47,72 @@ def parse_instruction(instruction):
     return move, params
 
 
-def dance(instructions, group=None):
+def compile_dance(instructions, group):
+    """
+    Reduce a dance to two permutations that can be applied independently: spins and exchanges only
+    ever move positions around, whatever the dancers are called, and partner swaps only ever swap
+    names, wherever the dancers are standing. positions[i] is the index a dancer ends up taking from
+    and names maps each dancer to who ends up standing in their place.
+    """
     if isinstance(instructions, str):
         instructions = instructions.strip().split(',')
-    
-    if group is None:
-        group = [val for val in 'abcdefghijklmnop']
-    else:
-        group = [val for val in group]
+
+    positions = list(range(len(group)))
+    names = list(group)
 
     for instruction in instructions:
 
         move, params = parse_instruction(instruction)
 
-        group = move(group, **params)
+        if move is partner:
+            names = exchange(names, names.index(params['a']), names.index(params['b']))
+        else:
+            positions = move(positions, **params)
 
-    return ''.join(group)
+    return positions, dict(zip(group, names))
 
 
-def keep_dancing(instructions, N, group=None):
-    if isinstance(instructions, str):
-        instructions = instructions.strip().split(',')
+def apply_dance(compiled, group):
+    positions, names = compiled
+    return ''.join(names[group[i]] for i in positions)
+
+
+def compose(first, second):
+    """
+    The dance that does first and then second
+    """
+    first_positions, first_names = first
+    second_positions, second_names = second
+    return [first_positions[i] for i in second_positions], {a: second_names[b] for a, b in first_names.items()}
 
+
+def repeat_dance(compiled, N):
+    # Exponentiation by squaring, so any N only takes O(log N) compositions
+    positions, names = compiled
+    result = (list(range(len(positions))), {name: name for name in names})
+    while N > 0:
+        if N & 1:
+            result = compose(result, compiled)
+        compiled = compose(compiled, compiled)
+        N >>= 1
+    return result
+
+
+def dance(instructions, group=None):
     if group is None:
         group = 'abcdefghijklmnop'
 
-    # Find the unique set of configurations and how long until we cycle back to the start
-    group_configs = [group]
-    for i in range(0, N):
-        group = dance(instructions, group)
-        if group in group_configs:
-            break
-        group_configs.append(group)
-        if (i+1) % 10000000 == 0:
-            print(i+1)
+    return apply_dance(compile_dance(instructions, group), group)
 
-    # Then we figure out where we would be in the loop at the requested number of iterations
-    ndx = N % len(group_configs) if len(group_configs) < N else i + 1
 
-    return group_configs[ndx]
+def keep_dancing(instructions, N, group=None):
+    if group is None:
+        group = 'abcdefghijklmnop'
+
+    return apply_dance(repeat_dance(compile_dance(instructions, group), N), group)
 
 
-with open('data/day16_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read()
+PUZZLE_INPUT = read_input(16)
 
 
 if __name__ == '__main__':
@@ -101,6 +125,8 @@ if __name__ == '__main__':
 
     assert dance('s1,x3/4,pe/b', 'abcde') == 'baedc'
     assert keep_dancing('s1,x3/4,pe/b', 2, 'abcde') == 'ceadb'
+    assert keep_dancing('s1,x3/4,pe/b', 0, 'abcde') == 'abcde'
+    assert keep_dancing('s1,x3/4,pe/b', 7, 'abcde') == dance('s1,x3/4,pe/b', keep_dancing('s1,x3/4,pe/b', 6, 'abcde'))
 
     print('All tests passed!')
     print('Solution 1: {:}'.format(dance(PUZZLE_INPUT)))
@@ -5,44 +5,98 @@ Michael Bell
 12/21/2017
 Solutions passed
 """
+from array import array
+
+
+class Spinlock(object):
+    """
+    Circular buffer kept as a list of small arrays so each insert only shifts one chunk, rather than
+    the whole buffer like list.insert does. Chunks are split in half once they get too long.
+    """
+
+    CHUNK_SIZE = 1024
+
+    def __init__(self, n_steps):
+        self.n_steps = n_steps
+        self.chunks = [array('I', [0])]
+        self.size = 1
+        # Chunk and offset of the current position
+        self.chunk = 0
+        self.offset = 0
+
+    def spin(self, n_cycles):
+
+        chunks = self.chunks
+        c, o = self.chunk, self.offset
+        chunk = chunks[c]
+
+        for i in range(self.size, self.size + n_cycles):
+            remaining = self.n_steps % i
+            while o + remaining >= len(chunk):
+                remaining -= len(chunk) - o
+                o = 0
+                c = c + 1 if c + 1 < len(chunks) else 0
+                chunk = chunks[c]
+            o += remaining + 1
+            chunk.insert(o, i)
+
+            if len(chunk) > 2 * self.CHUNK_SIZE:
+                chunks.insert(c + 1, chunk[self.CHUNK_SIZE:])
+                del chunk[self.CHUNK_SIZE:]
+                if o >= self.CHUNK_SIZE:
+                    o -= self.CHUNK_SIZE
+                    c += 1
+                    chunk = chunks[c]
+
+        self.size += n_cycles
+        self.chunk, self.offset = c, o
+
+    def value_after(self, value):
+
+        for c, chunk in enumerate(self.chunks):
+            if value in chunk:
+                o = chunk.index(value) + 1
+                while o == len(self.chunks[c]):
+                    c, o = (c + 1) % len(self.chunks), 0
+                return self.chunks[c][o]
+        raise ValueError('{:} is not in the buffer'.format(value))
 
 
 def spinlock(n_steps, n_cycles=2017, value_after=2017):
 
-    buffer = [0]
-    current_position = 0
-
-    for i in range(1, n_cycles + 1):
-
-        current_position = ((current_position + n_steps) % len(buffer)) + 1
-        buffer.insert(current_position, i)
-
-        if i % 500000 == 0:
-            print(i)
-
-    ndx = buffer.index(value_after) + 1
-    if ndx == len(buffer):
-        ndx = 0
-
-    return buffer[ndx]
+    buffer = Spinlock(n_steps)
+    buffer.spin(n_cycles)
+    return buffer.value_after(value_after)
 
 
 def spinlock_light(n_steps, n_cycles=50000000):
+    """
+    Value after 0 without keeping the buffer. 0 never moves from the front, so only inserts at
+    position 1 matter.
+    """
+
+    if n_steps == 0:
+        # Every insert goes straight after the last one, so 1 stays next to 0
+        return 1 if n_cycles >= 1 else None
 
     current_position = 0
 
     after_zero = None
 
-    for i in range(1, n_cycles + 1):
+    i = 1
+    while i <= n_cycles:
 
         current_position = ((current_position + n_steps) % i) + 1
 
         if current_position == 1:
             after_zero = i
-        
-        if i % 500000 == 0:
-            print(i)
-    
+
+        # The next inserts march forward n_steps + 1 at a time without wrapping round to the front,
+        # so they can be skipped over in one go
+        skip = min((i - current_position) // n_steps, n_cycles - i)
+        current_position += skip * (n_steps + 1)
+        i += skip + 1
+
     return after_zero
 
 
@@ -50,6 +104,9 @@ if __name__ == '__main__':
 
     assert spinlock(3) == 638
     assert spinlock_light(3, 9) == 9
+    assert spinlock_light(0, 9) == 1
+    assert spinlock(3, 20000, 0) == spinlock_light(3, 20000)
+    assert spinlock(337, 100000, 0) == spinlock_light(337, 100000)
 
     print('All tests passed!')
 
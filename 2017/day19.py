@@ -6,6 +6,7 @@ Michael Bell
 Solutions passed!
 """
 from typing import List, Tuple
+from helper import read_input
 
 
 def parse_maze(maze_as_string: str) -> List[List[str]]:
@@ -88,8 +89,7 @@ def traverse_maze(maze_as_string: str) -> List[str]:
     return breadcrumb, steps
 
 
-with open('data/day19_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read()
+PUZZLE_INPUT = read_input(19)
 
 
 if __name__ == '__main__':
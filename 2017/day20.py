@@ -5,6 +5,7 @@ Michael Bell
 12/23/2017
 Solutions passed
 """
+from helper import read_input
 
 class Vector(object):
     def __init__(self, xyz):
@@ -190,8 +191,7 @@ p=<-2,0,0>, v=< 1,0,0>, a=< 0,0,0>
 p=< 3,0,0>, v=<-1,0,0>, a=< 0,0,0>'''
 
 
-with open('data/day20_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read()
+PUZZLE_INPUT = read_input(20)
 
 if __name__ == '__main__':
     assert Vector((1, 2, 3)) + Vector((2, 3, 4)) == Vector((3, 5, 7))
@@ -5,7 +5,9 @@ Michael Bell
 12/23/2017
 Solutions passed!
 """
+from collections import Counter
 from math import sqrt
+from helper import read_input
 
 
 starting_pattern = '.#./..#/###'
@@ -125,55 +127,96 @@ def split_pattern(pattern):
     return sub_patterns
 
 
-def enhance_patterns(sub_patterns, enhancement_rules):
+def symmetries(pattern):
+    """
+    All 8 rotations and flips of a pattern.
+    """
+    for _ in range(4):
+        yield pattern
+        yield flip_pattern(pattern)
+        pattern = rotate_pattern(pattern)
 
-    enhanced_sub_patterns = {}
 
-    for sp_coords in sub_patterns:
+def build_rule_table(enhancement_rule_defs):
+    """
+    Map every rotation and flip of each rule's input to its output, so finding the rule for a
+    sub pattern is a single lookup.
+    """
+    rule_table = {}
+    for from_pattern, to_pattern in parse_enhancement_rules(enhancement_rule_defs).items():
+        for variant in symmetries(parse_pattern(from_pattern)):
+            rule_table[encode_pattern(variant)] = to_pattern
+    return rule_table
 
-        sub_pattern = sub_patterns[sp_coords]
 
-        while True:
-            encoded_sp = encode_pattern(sub_pattern)
-            if encoded_sp in enhancement_rules:
-                enhanced_sub_patterns[sp_coords] = parse_pattern(enhancement_rules[encoded_sp])
-                break
+def enhance_patterns(sub_patterns, rule_table):
+
+    enhanced_sub_patterns = {}
 
-            encoded_sp = encode_pattern(flip_pattern(sub_pattern))
-            if encoded_sp in enhancement_rules:
-                enhanced_sub_patterns[sp_coords] = parse_pattern(enhancement_rules[encoded_sp])
-                break
+    for sp_coords in sub_patterns:
 
-            sub_pattern = rotate_pattern(sub_pattern)
-        
-        if sp_coords not in enhanced_sub_patterns:
+        encoded_sp = encode_pattern(sub_patterns[sp_coords])
+        if encoded_sp not in rule_table:
             raise RuntimeError(f'Did not find an enhancement rule for {encoded_sp}')
 
-    return enhanced_sub_patterns
+        enhanced_sub_patterns[sp_coords] = parse_pattern(rule_table[encoded_sp])
 
+    return enhanced_sub_patterns
 
-def generate_image(enhancement_rule_defs, niter):
 
-    pattern = parse_pattern(starting_pattern)
-    enhancement_rules = parse_enhancement_rules(enhancement_rule_defs)
+def evolve(pattern, rule_table, niter):
 
     for _ in range(niter):
         sub_patterns = split_pattern(pattern)
 
-        sub_patterns = enhance_patterns(sub_patterns, enhancement_rules)
+        sub_patterns = enhance_patterns(sub_patterns, rule_table)
 
         pattern = stitch_sub_patterns(sub_patterns)
 
     return pattern
 
 
+def generate_image(enhancement_rule_defs, niter):
+
+    return evolve(parse_pattern(starting_pattern), build_rule_table(enhancement_rule_defs), niter)
+
+
+def count_on(pattern):
+    return sum(sum(1 for val in row if val == '#') for row in pattern)
+
+
+def count_pixels(enhancement_rule_defs, niter):
+    """
+    Count the pixels that are on after niter iterations without building the image. A 3x3 block
+    grows to 4x4, 6x6 and then 9x9, which splits back into nine 3x3 blocks, and all along it's split
+    along its own edges. So every 3 iterations each 3x3 block turns into nine new ones independently
+    of its neighbours, and all we need to track is how many there are of each.
+    """
+    rule_table = build_rule_table(enhancement_rule_defs)
+
+    blocks = Counter([starting_pattern])
+    children = {}
+
+    while niter >= 3:
+        next_blocks = Counter()
+        for block, count in blocks.items():
+            if block not in children:
+                grown = split_pattern(evolve(parse_pattern(block), rule_table, 3))
+                children[block] = Counter(encode_pattern(sub_pattern) for sub_pattern in grown.values())
+            for child, n in children[block].items():
+                next_blocks[child] += count * n
+        blocks = next_blocks
+        niter -= 3
+
+    return sum(count * count_on(evolve(parse_pattern(block), rule_table, niter)) for block, count in blocks.items())
+
+
 TEST_INPUT = '''../.# => ##./#../...
 .#./..#/### => #..#/..../..../#..#'''
 
 TEST_INPUT2 = '''#..#/..../..../#..#'''
 
-with open('data/day21_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read()
+PUZZLE_INPUT = read_input(21)
 
 
 if __name__ == "__main__":
@@ -195,23 +238,20 @@ if __name__ == "__main__":
     assert stitch_sub_patterns(sub_patterns) == parse_pattern(TEST_INPUT2)
 
     pattern = generate_image(TEST_INPUT, 2)
-    assert sum(sum(1 for val in row if val == '#') for row in pattern) == 12
-    
+    assert count_on(pattern) == 12
+    assert count_pixels(TEST_INPUT, 2) == 12
+
     print('Tests passed')
 
     pattern = generate_image(PUZZLE_INPUT, 5)
+    assert count_pixels(PUZZLE_INPUT, 5) == count_on(pattern)
+    assert count_pixels(PUZZLE_INPUT, 7) == count_on(generate_image(PUZZLE_INPUT, 7))
 
-    print('Solution 1: {:}'.format(sum(sum(1 for val in row if val == '#') for row in pattern)))
+    print('Solution 1: {:}'.format(count_on(pattern)))
 
     with open('data/day21_outpu1.txt', 'w') as f:
         to_write = '\n'.join([''.join(val for val in row) for row in pattern])
         f.write(to_write)
 
-    pattern = generate_image(PUZZLE_INPUT, 18)
-
-    print('Solution 2: {:}'.format(sum(sum(1 for val in row if val == '#') for row in pattern)))
-
-    with open('data/day21_outpu2.txt', 'w') as f:
-        to_write = '\n'.join([''.join(val for val in row) for row in pattern])
-        f.write(to_write)
-
+    # The full image at 18 iterations is 2187x2187, generate_image can still render it if needed
+    print('Solution 2: {:}'.format(count_pixels(PUZZLE_INPUT, 18)))
@@ -7,129 +7,102 @@ Solutions passed
 """
 
 
+from cells import Grid
+from helper import read_input
+
+
+CLEAN, WEAKENED, INFECTED, FLAGGED = range(4)
+
+# Directions in clockwise order, so turning right is +1
+UP, RIGHT, DOWN, LEFT = range(4)
+
+# For each node state, the number of right turns the carrier makes and the state it leaves the node in
+SIMPLE_RULES = {CLEAN: (3, INFECTED), INFECTED: (1, CLEAN)}
+EVOLVED_RULES = {CLEAN: (3, WEAKENED), WEAKENED: (0, INFECTED), INFECTED: (1, FLAGGED), FLAGGED: (2, CLEAN)}
+
+
 def parse_map(starting_map):
     """
-    We will use a sparse rep where we just keep track of which grid cells (coded as row #, col #) 
-    are infected.
+    Returns the grid and the index of its center cell, where the carrier starts.
     """
 
-    infected_cells = set()
-
-    rows = starting_map.replace('\r', '').split('\n')
-    
-    # Convert from (0, 0) in TLC to the center cell
-    col_offset = -(len(rows[0]) // 2)
-    row_offset = len(rows[0]) // 2
+    rows = starting_map.replace('\r', '').strip().split('\n')
 
+    grid = Grid(len(rows[0]), len(rows))
     for row_num, row in enumerate(rows):
-
         for col_num, val in enumerate(row):
             if val == '#':
-                infected_cells.add((
-                    len(row) - 1 - row_num - row_offset, 
-                    col_num + col_offset
-                ))
-
-    return infected_cells
-
-
-def turn_right(direction):
-    if direction == 'up':
-        return 'right'
-    elif direction == 'right':
-        return 'down'
-    elif direction == 'down':
-        return 'left'
-    else:
-        return 'up'
-
-
-def turn_left(direction):
-    if direction == 'up':
-        return 'left'
-    elif direction == 'right':
-        return 'up'
-    elif direction == 'down':
-        return 'right'
-    else:
-        return 'down'
-
-
-def take_step(pos, direction):
-    if direction == 'up':
-        new_pos = (pos[0] + 1, pos[1])
-    elif direction == 'right':
-        new_pos = (pos[0], pos[1] + 1)
-    elif direction == 'down':
-        new_pos = (pos[0] - 1, pos[1])
-    else:
-        new_pos = (pos[0], pos[1] - 1)
-    return new_pos
+                grid.cells[grid.index(row_num, col_num)] = INFECTED
 
+    return grid, grid.index(len(rows) // 2, len(rows[0]) // 2)
 
-def count_infections(starting_map, n_bursts):
 
-    carrier_position = (0, 0)
-    carrier_direction = 'up'
+def build_transitions(rules):
+    """
+    Tables indexed by node state * 4 + carrier direction, giving the carrier's new direction and
+    the node's new state.
+    """
+    directions = bytearray(16)
+    states = bytearray(16)
+    for state in range(4):
+        turns, next_state = rules.get(state, (0, state))
+        for direction in range(4):
+            directions[state * 4 + direction] = (direction + turns) % 4
+            states[state * 4 + direction] = next_state
+    return directions, states
+
+
+def spread_infection(starting_map, n_bursts, rules):
+
+    grid, i = parse_map(starting_map)
+    directions, states = build_transitions(rules)
+
+    cells = grid.cells
+    steps = (-grid.stride, 1, grid.stride, -1)
+    direction = UP
     infection_count = 0
-    infected_cells = parse_map(starting_map)
-
-    for i in range(n_bursts):
-        if carrier_position in infected_cells:
-            carrier_direction = turn_right(carrier_direction)
-            infected_cells.remove(carrier_position)
-        else:
-            carrier_direction = turn_left(carrier_direction)
-            infected_cells.add(carrier_position)
+
+    for _ in range(n_bursts):
+        transition = cells[i] * 4 + direction
+        if transition >= 16:
+            # Stepped onto the edge of the grid
+            i = grid.grow(i)
+            cells = grid.cells
+            steps = (-grid.stride, 1, grid.stride, -1)
+            transition = direction
+
+        direction = directions[transition]
+        state = states[transition]
+        cells[i] = state
+        if state == INFECTED:
             infection_count += 1
 
-        carrier_position = take_step(carrier_position, carrier_direction)
-    
+        i += steps[direction]
+
     return infection_count
 
 
+def count_infections(starting_map, n_bursts):
+
+    return spread_infection(starting_map, n_bursts, SIMPLE_RULES)
+
+
 def count_infections_evolved(starting_map, n_bursts):
 
-    carrier_position = (0, 0)
-    carrier_direction = 'up'
-    infection_count = 0
-    infected_cells = parse_map(starting_map)
-    weakened_cells = set()
-    flagged_cells = set()
-
-    for i in range(n_bursts):
-        if carrier_position in infected_cells:
-            carrier_direction = turn_right(carrier_direction)
-            infected_cells.remove(carrier_position)
-            flagged_cells.add(carrier_position)
-        elif carrier_position in weakened_cells:
-            weakened_cells.remove(carrier_position)
-            infected_cells.add(carrier_position)
-            infection_count += 1
-        elif carrier_position in flagged_cells:
-            # Turn around by turning twice in one direction
-            carrier_direction = turn_right(carrier_direction)
-            carrier_direction = turn_right(carrier_direction)
-            flagged_cells.remove(carrier_position)  # becomes clean
-        else:
-            carrier_direction = turn_left(carrier_direction)
-            weakened_cells.add(carrier_position)
-
-        carrier_position = take_step(carrier_position, carrier_direction)
-    
-    return infection_count
+    return spread_infection(starting_map, n_bursts, EVOLVED_RULES)
 
 
 TEST_INPUT = '''..#
 #..
 ...'''
 
-with open('data/day22_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read()
+PUZZLE_INPUT = read_input(22)
 
 if __name__ == '__main__':
 
-    assert parse_map(TEST_INPUT).difference(set([(1, 1), (0, -1)])) == set()
+    grid, i = parse_map(TEST_INPUT)
+    assert grid.position(i) == (1, 1)
+    assert [i for i, val in enumerate(grid.cells) if val == INFECTED] == [grid.index(0, 2), grid.index(1, 0)]
 
     assert count_infections(TEST_INPUT, 7) == 5
     assert count_infections(TEST_INPUT, 70) == 41
@@ -7,106 +7,35 @@ Solutions passed
 """
 
 
-class Coprocessor(object):
-    def __init__(self, debug_mode=True):
-        self.registers = [0] * 8
-        self.register_names = [letter for letter in 'abcdefgh']
+from assembly import AssemblyVM, HALTED, SUB
+from helper import read_input
+
+
+class Coprocessor(AssemblyVM):
+    def __init__(self, debug_mode=True, profile=False):
+        super(Coprocessor, self).__init__(register_names='abcdefgh', profile=profile)
         if not debug_mode:
             self.set_register('a', 1)
 
-    def get_register(self, reg):
-        return self.registers[self.reg_index(reg)]
-
-    def reg_index(self, reg):
-        return self.register_names.index(reg)
-    
-    def set_register(self, reg, val):
-        ndx = self.reg_index(reg)
-        self.registers[ndx] = val
-
-    def multiply_register(self, reg, val):
-        ndx = self.reg_index(reg)
-        self.registers[ndx] *= val
-    
-    def sub_from_register(self, reg, val):
-        ndx = self.reg_index(reg)
-        self.registers[ndx] -= val
-
-    def _get_op_params(self, X, Y):
-        try:
-            params = {'reg': X, 'val': int(Y)}
-        except ValueError:
-            params = {'reg': X, 'val': self.get_register(Y)}
-        return params
-
-    def jump_instructions(self, test_val, offset):
-        if test_val != 0:
-            return offset
-        else:
-            return 1
-
-    def parse_instruction(self, instruction):
-
-        parts = instruction.split()
-
-        if parts[0] == 'set':
-            func = self.set_register
-            params = self._get_op_params(*parts[1:])
-
-        elif parts[0] == 'sub':
-            func = self.sub_from_register
-            params = self._get_op_params(*parts[1:])
-
-        elif parts[0] == 'mul':
-            func = self.multiply_register
-            params = self._get_op_params(*parts[1:])
-            
-        elif parts[0] == 'jnz':
-            func = self.jump_instructions
-
-            try:
-                test_val = int(parts[1])
-            except ValueError:
-                test_val = self.get_register(parts[1])
-
-            try:
-                offset = int(parts[2])
-            except ValueError:
-                offset = self.get_register(parts[2])
-
-            params = {'test_val': test_val, 'offset': offset}
-
-        else:
-            raise ValueError('Unrecognized instruction')
-    
-        return func, params
-    
-    def execute_program(self, program, return_first=True):
-
-        if isinstance(program, str):
-            program = program.replace('\r', '').split('\n')
-        
-        current_instruction = 0
-        mul_invocations = 0
-
-        while current_instruction >= 0 and current_instruction < len(program):
-            func, params = self.parse_instruction(program[current_instruction])
-            
-            res = func(**params)
-
-            if func == self.multiply_register:
-                mul_invocations += 1
-            
-            if func == self.jump_instructions:
-                current_instruction += res
-            else:
-                current_instruction += 1
-        
-        return mul_invocations
-
-
-with open('data/day23_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read()
+    def execute_program(self, program, max_steps=None):
+        """
+        Run the program, returning how many times mul was invoked
+        """
+        self.load(program)
+        self.run(max_steps)
+
+        return self.mul_count
+
+    def run_to(self, target, max_steps=10000):
+        """
+        Single step until the PC reaches target, which had better happen within max_steps
+        """
+        while self.pc != target:
+            if self.steps >= max_steps or self.run(max_steps=1) == HALTED:
+                raise ValueError('The program never reached pc {:}'.format(target))
+
+
+PUZZLE_INPUT = read_input(23)
 
 
 if __name__ == '__main__':
@@ -115,13 +44,31 @@ if __name__ == '__main__':
     print("Solution 1: {:}".format(coproc.execute_program(PUZZLE_INPUT)))
 
     # For solution 2, I have analyzed the program and figured out what
-    # it does (counts non-primes between 107900 and 124900)
-    # So I'm just going to get the answer using a short piece of code
-    # that does the same thing. 
-    # See `data/day23_input_annotated.txt` for notes from my analysis
+    # it does (counts non-primes between b and c inclusive in steps of 17)
+    # See `data/day23_input_annotated.txt` for notes from my analysis.
+    # Profiling a short run shows all the time is spent in the innermost loop,
+    # so rather than run it we let the program set up b and c, stopping at the
+    # start of the outermost loop, and then do the same thing as the loops in Python.
+    coproc = Coprocessor(debug_mode=False, profile=True)
+    coproc.execute_program(PUZZLE_INPUT, max_steps=100000)
+    _, hottest, _ = coproc.hot_spots(1)[0]
+    loops = coproc.loops()
+    if not any(start <= hottest <= end for start, end in loops):
+        raise ValueError('The hottest instruction (pc {:}) is not in a loop'.format(hottest))
+    outer_start, outer_end = max(loops, key=lambda loop: loop[1] - loop[0])
+
+    coproc = Coprocessor(debug_mode=False)
+    coproc.load(PUZZLE_INPUT)
+    coproc.run_to(outer_start)
+    b_ndx = coproc.reg_index('b')
+    steps = [-y for op, x, _, y, _, _ in coproc.instructions[outer_start:outer_end] if op == SUB and x == b_ndx]
+    if not steps:
+        raise ValueError('The outer loop never steps b')
+    step = steps[-1]
+
     def is_prime(a):
-        return all(a % i for i in range(2, a))
+        return all(a % i for i in range(2, int(a ** 0.5) + 1))
 
     print('Solution 2: {:}'.format(
-        sum(not is_prime(x) for x in range(107900, 124901, 17))
+        sum(not is_prime(x) for x in range(coproc.get_register('b'), coproc.get_register('c') + 1, step))
     ))
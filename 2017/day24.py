@@ -4,6 +4,10 @@ https://adventofcode.com/2017/day/24
 Michael Bell
 12/29/2017
 """
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import os
+from helper import read_input
 
 
 def parse_piece(piece_def):
@@ -18,104 +22,82 @@ def get_pieces(piece_defs):
     )
 
 
-def get_connecting_pieces(connector, pieces):
-    candidate_connections = set()
-    
-    for piece in pieces:
-        if piece[0] == connector or piece[1] == connector:
-            candidate_connections.add(piece)
+def index_pieces(pieces):
+    """
+    For each port, the (piece number, port at the other end, strength) of every piece that has it.
+    Pieces are numbered so the ones in use can be kept as bits of an integer.
+    """
+    by_port = defaultdict(list)
+    for ndx, (a, b) in enumerate(sorted(pieces)):
+        by_port[a].append((ndx, b, a + b))
+        if b != a:
+            by_port[b].append((ndx, a, a + b))
+    return by_port
 
-    return candidate_connections
 
+def search_bridges(by_port, open_connector=0, used=0, strength=0, length=0):
+    """
+    Depth first search over every bridge that extends the given one, keeping only the best found
+    so far rather than a list of every bridge. Returns the strength of the strongest bridge and the
+    (length, strength) of the longest, strongest one.
+    """
+    best = [strength, (length, strength)]
 
-def get_bridge_strengths(open_connector, pieces):
-    
-    if not pieces:
-        return []
+    def extend(open_connector, used, strength, length):
+        if strength > best[0]:
+            best[0] = strength
+        if (length, strength) > best[1]:
+            best[1] = (length, strength)
 
-    possible_connecting_pieces = get_connecting_pieces(open_connector, pieces)
+        for ndx, new_connector, piece_strength in by_port[open_connector]:
+            if not used & (1 << ndx):
+                extend(new_connector, used | (1 << ndx), strength + piece_strength, length + 1)
 
-    strengths = []
+    extend(open_connector, used, strength, length)
 
-    for possible_connecting_piece in possible_connecting_pieces:
+    return best[0], best[1]
 
-        new_connector = possible_connecting_piece[0] \
-            if possible_connecting_piece[0] != open_connector \
-            else possible_connecting_piece[1]
 
-        other_pieces = pieces.difference([possible_connecting_piece])
+def _search_from(args):
+    by_port, ndx, new_connector, piece_strength = args
+    return search_bridges(by_port, new_connector, 1 << ndx, piece_strength, 1)
 
-        this_connection_strengths = get_bridge_strengths(new_connector, other_pieces)
 
-        if not this_connection_strengths:
-            strengths.append(possible_connecting_piece[0] + possible_connecting_piece[1])
-        else:
-            strengths.extend([
-                tcs + possible_connecting_piece[0] + possible_connecting_piece[1] 
-                for tcs in this_connection_strengths
-            ])
+def best_bridges(pieces, jobs=1):
+    """
+    Returns the strength of the strongest bridge and the (length, strength) of the longest, strongest
+    bridge, searching from each possible first piece across a process pool if jobs > 1.
+    """
+    by_port = index_pieces(pieces)
+    tasks = [(by_port, ndx, new_connector, piece_strength) for ndx, new_connector, piece_strength in by_port[0]]
 
-    return strengths
+    if jobs <= 1:
+        results = list(map(_search_from, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_search_from, tasks))
 
+    return max([0] + [strongest for strongest, _ in results]), max([(0, 0)] + [longest for _, longest in results])
 
-def get_bridge_strengths_lengths(open_connector, pieces):
-    
-    if not pieces:
-        return []
 
-    possible_connecting_pieces = get_connecting_pieces(open_connector, pieces)
+TEST_INPUT = """0/2
+2/2
+2/3
+3/4
+3/5
+0/1
+10/1
+9/10"""
 
-    strengths = []
-
-    for possible_connecting_piece in possible_connecting_pieces:
-
-        new_connector = possible_connecting_piece[0] \
-            if possible_connecting_piece[0] != open_connector \
-            else possible_connecting_piece[1]
-
-        other_pieces = pieces.difference([possible_connecting_piece])
-
-        this_connection_strengths = get_bridge_strengths_lengths(new_connector, other_pieces)
-
-        if not this_connection_strengths:
-            strengths.append(
-                (possible_connecting_piece[0] + possible_connecting_piece[1], 1)
-            )
-        else:
-            strengths.extend([
-                (tcs[0] + possible_connecting_piece[0] + possible_connecting_piece[1], tcs[1] + 1) 
-                for tcs in this_connection_strengths
-            ])
-
-    return strengths
-
-
-with open('data/day24_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read()
-
-
-def get_strongest_longest_bridge(strengths_lengths):
-
-    longest_length = -1
-    strongest_strength = -1
-    strongest_longest_bridge = None
-
-    for strength_length in strengths_lengths:
-        if ((strength_length[1] > longest_length) or (strength_length[1] == longest_length and strength_length[0] > strongest_strength)):
-            strongest_longest_bridge = strength_length
-            longest_length = strength_length[1]
-            strongest_strength = strength_length[0]
-    
-    return strongest_longest_bridge
+PUZZLE_INPUT = read_input(24)
 
 
 if __name__ == '__main__':
 
-    pieces = get_pieces(PUZZLE_INPUT)
-
-    possible_strengths = get_bridge_strengths(0, pieces)
-    print('Solution 1: {:}'.format(max(possible_strengths)))
+    assert best_bridges(get_pieces(TEST_INPUT)) == (31, (4, 19))
+    assert best_bridges(get_pieces(TEST_INPUT), jobs=2) == (31, (4, 19))
+    print('All tests passed!')
 
-    possible_strengths_lengths = get_bridge_strengths_lengths(0, pieces)
-    strongest_longest = get_strongest_longest_bridge(possible_strengths_lengths)
-    print('Solution 2: {:}'.format(strongest_longest[0]))
+    strongest, (longest_length, longest_strength) = best_bridges(get_pieces(PUZZLE_INPUT), os.cpu_count() or 1)
+    print('Solution 1: {:}'.format(strongest))
+    print('Solution 2: {:}'.format(longest_strength))
@@ -5,7 +5,8 @@ Michael Bell
 12/29/2017
 """
 
-from collections import defaultdict
+from cells import Tape
+from helper import read_input
 
 
 TEST_INPUT = '''Begin in state A.
@@ -75,28 +76,92 @@ def parse_blueprint(blueprint):
     return states, starting_state, checksum_after
 
 
+# The tape is stored as blocks of this many slots, one per bit of an integer
+BLOCK_SIZE = 64
+
+# Give up on remembering where a block leads to if the machine hasn't left it after this many steps
+MAX_BLOCK_STEPS = 100000
+
+
+def compile_blueprint(states):
+    """
+    Number the states and lay out the instructions in a flat table indexed by
+    state number * 2 + current value, holding (value to write, move, next state number)
+    """
+    state_numbers = {state: n for n, state in enumerate(states)}
+
+    transitions = []
+    for state in states:
+        for value in (0, 1):
+            instruction = states[state][value]
+            transitions.append((instruction['write'], instruction['move'], state_numbers[instruction['next_state']]))
+
+    return transitions, state_numbers
+
+
+def run_block(transitions, state, block, slot, max_steps):
+    """
+    Run the machine within one block of the tape, starting at slot, until it moves off either end
+    or has taken max_steps steps. Returns (block, slot, state, steps).
+    """
+    steps = 0
+    while 0 <= slot < BLOCK_SIZE and steps != max_steps:
+        value = block >> slot & 1
+        value, move, state = transitions[2 * state + value]
+        block = block & ~(1 << slot) | value << slot
+        slot += move
+        steps += 1
+    return block, slot, state, steps
+
+
 def execute_blueprint(states, starting_state, checksum_after):
+    """
+    The machine only sees the block of the tape it's in, so what happens between walking into a block
+    and walking out of it again only depends on the state, the block's contents and which end it came
+    in from. Those runs are remembered, and the tape is stepped through a whole block at a time.
+    """
+
+    transitions, state_numbers = compile_blueprint(states)
 
-    tape = defaultdict(int)
+    tape = Tape(typecode='Q')
+    cells = tape.cells
+    block_ndx = tape.origin
     slot = 0
-    current_state = starting_state
+    current_state = state_numbers[starting_state]
+    remaining = checksum_after
+    known_runs = {}
 
-    # print(0, current_state, slot, tape)
+    while remaining:
+        key = (current_state, cells[block_ndx], slot)
+        run = known_runs.get(key)
+        if run is None:
+            run = known_runs[key] = run_block(transitions, current_state, cells[block_ndx], slot, MAX_BLOCK_STEPS)
 
-    for step in range(checksum_after):
-        instruction = states[current_state][tape[slot]]
+        block, next_slot, next_state, steps = run
+        if steps > remaining or 0 <= next_slot < BLOCK_SIZE:
+            # Finishes part way through the block (or never leaves it), just do the steps left
+            block, next_slot, next_state, steps = run_block(transitions, current_state, cells[block_ndx], slot, remaining)
 
-        tape[slot] = instruction['write']
-        slot += instruction['move']
-        current_state = instruction['next_state']
+        cells[block_ndx] = block
+        current_state = next_state
+        remaining -= steps
 
-        # print(step + 1, current_state, slot, tape)
-    
-    return sum(tape[x] for x in tape)
+        if next_slot < 0:
+            block_ndx -= 1
+            slot = BLOCK_SIZE - 1
+        elif next_slot >= BLOCK_SIZE:
+            block_ndx += 1
+            slot = 0
+        else:
+            slot = next_slot
+
+        if block_ndx < 0 or block_ndx >= len(cells):
+            block_ndx = tape.grow(block_ndx)
+
+    return sum(block.bit_count() for block in cells)
 
 
-with open('data/day25_input.txt', 'r') as f:
-    PUZZLE_INPUT = f.read()
+PUZZLE_INPUT = read_input(25)
 
 if __name__ == '__main__':
 
@@ -5,6 +5,7 @@
 import itertools
 from time import time
 from sortedcontainers import SortedList
+from helper import read_input_lines
 
 
 def frequency_drift(freq_changes, start_freq=0):
@@ -44,11 +45,9 @@ def first_repeated_frequency_faster(freq_changes, start_freq=0):
     return current_freq
 
 
-def parse_freq_changes(freq_changes_file):
-    with open(freq_changes_file, 'r') as f:
-        fcs = f.readlines()
+def parse_freq_changes(freq_changes):
 
-    return [int(i) for i in fcs]
+    return [int(i) for i in freq_changes]
 
 
 if __name__ == '__main__':
@@ -65,7 +64,7 @@ if __name__ == '__main__':
 
     assert first_repeated_frequency(test1) == 2
 
-    input1 = parse_freq_changes('./data/day01_input.txt')
+    input1 = parse_freq_changes(read_input_lines(1))
 
     print(f'Solution 1: {frequency_drift(input1)}')
 
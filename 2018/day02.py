@@ -4,6 +4,7 @@
 # 12/2/2018
 from sortedcontainers import SortedList
 from time import time
+from helper import read_input_lines
 
 
 def has_n_of_any_char(box_id, n=2):
@@ -96,8 +97,7 @@ if __name__ == '__main__':
 
     assert find_neighboring_ids(test_ids2) == 'fgij'
 
-    with open('./data/day02_input.txt', 'r') as f:
-        input1 = f.readlines()
+    input1 = read_input_lines(2)
     
     print(f"Solution 1: {checksum(input1)}")
     
@@ -3,6 +3,9 @@
 # Michael Bell
 # 12/3/2018
 
+from helper import read_input_lines
+
+
 class Claim(object):
     def __init__(self, claim_id, x, y, w, h):
         self.claim_id = claim_id
@@ -91,9 +94,7 @@ if __name__ == '__main__':
     assert test_fabric.claimed_area() == 4
     assert test_fabric.non_overlapping_claims()[0] == 3
 
-    with open('./data/day03_input.txt', 'r') as f:
-        tmp = f.readlines()
-        input1 = [parse_claim(t) for t in tmp]
+    input1 = [parse_claim(t) for t in read_input_lines(3)]
     
     fabric = Fabric(1000)
     fabric.claim_areas(input1)
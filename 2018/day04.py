@@ -5,6 +5,7 @@
 
 from datetime import datetime
 from collections import defaultdict
+from helper import read_input
 
 
 def get_time_and_message(activity_record):
@@ -156,8 +157,7 @@ if __name__ == '__main__':
     assert strategy1(tmp)[0] == 10 and strategy1(tmp)[1] == 24
     assert strategy2(tmp)[0] == 99 and strategy2(tmp)[1] == 45
 
-    with open('./data/day04_input.txt', 'r') as f:
-        input1 = f.read()
+    input1 = read_input(4)
 
     shift_logs = parse_activity_log(input1)
     guard_id, max_minute = strategy1(shift_logs)
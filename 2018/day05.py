@@ -2,60 +2,76 @@
 # https://adventofcode.com/2018/day/5
 # Michael Bell
 # 12/5/2018
-import sys
+from concurrent.futures import ProcessPoolExecutor
+import os
+import string
+from helper import read_bytes
 
 
-def reduce_polymer(polymer):
+# A unit and its opposite polarity only differ in the ASCII case bit
+CASE_BIT = ord('a') ^ ord('A')
+
+
+def react(units, remaining=None):
+    """
+    Run the reaction over an iterable of units (as byte values), in one pass with a stack: each unit
+    either annihilates the unit on top of the stack or is pushed onto it. Returns the stack, which is
+    the reduced polymer. Passing it back in as remaining carries on reacting with more units, so a
+    polymer can be streamed through a chunk at a time.
+    """
+    stack = bytearray() if remaining is None else remaining
 
-    while True:
-        pairs_to_remove = []
-        for unit1, unit2 in zip(polymer[:-1], polymer[1:]):
-            if (
-                (unit1.islower() and unit1.upper() == unit2) or 
-                (unit1.isupper() and unit1.lower() == unit2)
-            ):
-                pairs_to_remove.append(unit1 + unit2)
-        
-        pairs_to_remove = set(pairs_to_remove)
-        
-        reduced_polymer = polymer
-        for unit_pair in pairs_to_remove:
-            reduced_polymer = reduced_polymer.replace(unit_pair, '')
-        
-        if reduced_polymer == '' or reduced_polymer == polymer:
-            break
+    for unit in units:
+        if stack and stack[-1] ^ unit == CASE_BIT:
+            stack.pop()
         else:
-            polymer = reduced_polymer
-    
-    return reduced_polymer
+            stack.append(unit)
+
+    return stack
 
 
-def recursive_reduce_polymer(polymer):
+def react_stream(source, chunk_size=65536):
     """
-    I think this works, but leads to a max recursion error on the full data set.
+    Reduce the polymer read from a binary file object, or a bytes-like object such as the memory
+    mapped input, a chunk at a time without making a copy of the whole raw polymer.
     """
-    for i, unit in enumerate(polymer[:-1]):
-        if (
-            (unit.islower() and unit.upper() == polymer[i+1]) or 
-            (unit.isupper() and unit.lower() == polymer[i+1])
-        ):
-            return recursive_reduce_polymer(polymer[:i] + polymer[i+2:])
-    return polymer
+    if hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(chunk_size), b'')
+    else:
+        view = memoryview(source)
+        chunks = (bytes(view[start:start + chunk_size]) for start in range(0, len(view), chunk_size))
 
+    stack = bytearray()
+    for chunk in chunks:
+        react(chunk.translate(None, string.whitespace.encode('ascii')), stack)
+    return stack
 
-def optimal_polymer_length(polymer):
 
-    units = set(polymer.lower())
-    reduced_lengths = {}
+def reduce_polymer(polymer):
 
-    for unit in units:
-        reduced_lengths[unit] = len(
-            reduce_polymer(
-                polymer.replace(unit, '').replace(unit.upper(), '')
-            )
-        )
+    return react(polymer.strip().encode('ascii')).decode('ascii')
 
-    return min(reduced_lengths.values())
+
+def _length_without(args):
+    reduced, unit = args
+    return len(react(reduced.translate(None, bytes([unit, unit ^ CASE_BIT]))))
+
+
+def optimal_polymer_length(polymer, jobs=1):
+    """
+    Removing a unit type can only let more of the polymer react, never undo a reaction, so each
+    removal is tested on the reduced polymer instead of starting from scratch.
+    """
+    if isinstance(polymer, str):
+        polymer = polymer.strip().encode('ascii')
+    reduced = react(polymer)
+
+    tasks = [(reduced, unit) for unit in set(reduced.lower())]
+
+    if jobs <= 1:
+        return min(map(_length_without, tasks), default=len(reduced))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return min(executor.map(_length_without, tasks), default=len(reduced))
 
 
 if __name__ == '__main__':
@@ -66,15 +82,15 @@ if __name__ == '__main__':
     assert reduce_polymer('aabAAB') == 'aabAAB'
     assert reduce_polymer('dabAcCaCBAcCcaDA') == 'dabCBAcaDA'
 
-    with open('./data/day05_input.txt', 'r') as f:
-        input1 = f.read()
-
-    print(recursive_reduce_polymer('dabAcCaCBAcCcaDA'))
+    assert optimal_polymer_length('dabAcCaCBAcCcaDA') == 4
+    assert optimal_polymer_length('dabAcCaCBAcCcaDA', jobs=2) == 4
+    assert optimal_polymer_length('aA') == 0
+    assert optimal_polymer_length('aA', jobs=2) == 0
 
-    reduced_polymer = reduce_polymer(input1)
+    reduced_polymer = react_stream(read_bytes(5))
 
     print(f'Solution 1: {len(reduced_polymer)}')
 
-    optimal_length = optimal_polymer_length(input1)
+    optimal_length = optimal_polymer_length(reduced_polymer, os.cpu_count() or 1)
 
     print(f'Solution 2: {optimal_length}')
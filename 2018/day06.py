@@ -5,6 +5,7 @@
 import sys
 import tqdm
 from collections import defaultdict
+from helper import read_input
 
 
 def dict_keymin(d):
@@ -154,8 +155,7 @@ if __name__ == '__main__':
     show_cells_within_total_dist(test_total_dist_grid, 32)
     assert area_within_total_dist(test_total_dist_grid, 32) == 16
 
-    with open('./data/day06_input.txt', 'r') as f:
-        input1 = f.read()
+    input1 = read_input(6)
 
     coordinates = parse_coordinates(input1)
     dist_grid = make_grid_of_nearest_coordinates(coordinates)
@@ -2,6 +2,7 @@
 # https://adventofcode.com/2018/day/7
 # Michael Bell
 # 12/7/2018
+from helper import read_input_lines
 
 
 class Step(object):
@@ -182,9 +183,7 @@ Step F must be finished before step E can begin.'''.split('\n')
     assert test_build_steps == 'CABFDE'
     assert test_build_time == 15
 
-    with open('./data/day07_input.txt', 'r') as f:
-        input1 = f.readlines()
-        input1 = [l for l in input1 if len(l) > 0]
+    input1 = read_input_lines(7)
     
     graph = create_instruction_graph(input1)
     print(f'Solution 1: {get_step_sequence(graph)}')
@@ -3,6 +3,8 @@
 # Michael Bell
 # 12/8/2018
 
+from helper import read_input
+
 
 class Node(object):
     def __init__(self, parent=None):
@@ -68,8 +70,7 @@ if __name__ == '__main__':
     assert tally_metadata(test_root_node) == 138
     assert get_node_value(test_root_node) == 66 
 
-    with open('./data/day08_input.txt', 'r') as f:
-        input1 = f.read()
+    input1 = read_input(8)
     tree_list = parse_list(input1)
 
     root_node, _ = parse_node(tree_list)
@@ -4,79 +4,51 @@
 # 12/9/2019
 
 
-class Marble(object):
-    """
-    Essentially an item in a linked circular list.
-    """
-    def __init__(self, value):
-        self.value = value
-        self.cw_neighbor = None
-        self.ccw_neighbor = None
-    def __repr__(self):
-        return f"Marble({self.value})"
-    
-
-def insert_cw_after(marble, new_marble):
-    """
-    For a given MARBLE, insert the NEW_MARBLE into the circle as MARBLE's neigbor 
-    in the CW direction.
-    """
-    new_marble_ccw_neighbor = marble
-    new_marble_cw_neighbor = marble.cw_neighbor
-
-    new_marble.ccw_neighbor = new_marble_ccw_neighbor
-    new_marble_ccw_neighbor.cw_neighbor = new_marble
-
-    new_marble.cw_neighbor = new_marble_cw_neighbor
-    new_marble_cw_neighbor.ccw_neighbor = new_marble
-
+from array import array
 
-def remove_marble(marble):
-    """
-    Remove the given MARBLE from the circle of marbles.
-    """
-    marble.ccw_neighbor.cw_neighbor = marble.cw_neighbor
-    marble.cw_neighbor.ccw_neighbor = marble.ccw_neighbor
-
-    return marble.cw_neighbor
 
-
-def play_marble_game(n_players, last_marble_value):
+def play_marble_game(n_players, last_marble_value, show_circle=False):
     """
     Given a number of players and number of marbles to play through, build up 
     the circle of marbles and tally up player scores according to the rules in the 
     challenge. Return the max score.
-    """
 
-    current_marble = Marble(0)
-    current_marble.cw_neighbor = current_marble
-    current_marble.ccw_neighbor = current_marble
-
-    next_marble_value = 1
-    current_player = 0
-    player_scores = {player_id: 0 for player_id in range(n_players)}
+    The circle is a doubly linked list kept in two arrays indexed by marble value: cw[m] is
+    the value of marble m's neighbor in the CW direction and ccw[m] the one CCW.
+    """
 
-    while next_marble_value <= last_marble_value: 
-        if next_marble_value % 23 != 0:
-            new_marble = Marble(next_marble_value)
-            insert_cw_after(current_marble.cw_neighbor, new_marble)
-            current_marble = new_marble
+    cw = array('l', [0]) * (last_marble_value + 1)
+    ccw = array('l', [0]) * (last_marble_value + 1)
+
+    current_marble = 0
+    player_scores = [0] * n_players
+
+    for marble in range(1, last_marble_value + 1):
+        if marble % 23 != 0:
+            # Insert between the marbles 1 and 2 places CW of the current one
+            before = cw[current_marble]
+            after = cw[before]
+            cw[before] = marble
+            ccw[marble] = before
+            cw[marble] = after
+            ccw[after] = marble
+            current_marble = marble
         else:
-            player_scores[current_player] += next_marble_value
-
             marble_to_remove = current_marble
             for _ in range(7):
-                marble_to_remove = marble_to_remove.ccw_neighbor
-            player_scores[current_player] += marble_to_remove.value
-            current_marble = remove_marble(marble_to_remove)
+                marble_to_remove = ccw[marble_to_remove]
+            player_scores[marble % n_players] += marble + marble_to_remove
 
-        # For testing
-        # print_marble_circle(current_marble)
+            before = ccw[marble_to_remove]
+            after = cw[marble_to_remove]
+            cw[before] = after
+            ccw[after] = before
+            current_marble = after
 
-        current_player = (current_player + 1) % n_players
-        next_marble_value += 1
+        if show_circle:
+            print_marble_circle(cw)
 
-    return max(player_scores.values())
+    return max(player_scores)
 
 
 def parse_game_spec(game_spec):
@@ -89,18 +61,14 @@ def parse_game_spec(game_spec):
     return int(pieces[0]), int(pieces[-2])
 
 
-def print_marble_circle(marble):
+def print_marble_circle(cw):
     """
-    Given any MARBLE in the circle, print the value of the marbles in the circle, starting from
-    the 0th marble.
+    Given the CW links of the circle, print the value of the marbles in the circle, starting 
+    from the 0th marble.
     """
-    while marble.value != 0:
-        marble = marble.cw_neighbor
-    
-    values = [marble.value]
-    while marble.cw_neighbor.value != 0:
-        marble = marble.cw_neighbor
-        values.append(marble.value)
+    values = [0]
+    while cw[values[-1]] != 0:
+        values.append(cw[values[-1]])
     
     print(' '.join([str(v) for v in values]))
 
@@ -3,6 +3,7 @@
 # Michael Bell
 # 12/10/2018
 import sys
+from helper import read_input
 
 
 def parse_point_spec(point_spec):
@@ -118,8 +119,7 @@ position=<-3,  6> velocity=< 2, -1>'''
     find_message(test_x, test_v)
     print()
 
-    with open('./data/day10_input.txt', 'r') as f:
-        input1 = f.read()
+    input1 = read_input(10)
 
     x, v = parse_point_spec(input1)
 
@@ -2,24 +2,10 @@
 # https://adventofcode.com/2018/day/11
 # Michael Bell
 # 12/11/2018
-from tqdm import tqdm
-from joblib import Parallel, delayed
-import sys
-
-
-def dict_keymax(d):
-    """
-    Given a dictionary of arbitrary keys and integer values >= 0, return the key of the max
-    item with the max value.
-    """
-    max_k = sys.maxsize * -1
-    max_v = sys.maxsize * -1
-    for k in d:
-        v = d[k]
-        if v > max_v:
-            max_v = v
-            max_k = k
-    return max_k
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import operator
+import os
 
 
 def compute_power(x, y, sn):
@@ -58,31 +44,72 @@ def get_total_power(grid):
     return total_power
 
 
-def find_max_power_patch(grid, patch_size=3):
+def summed_area_table(grid):
+    """
+    Row y, column x holds the total power of the grid above and to the left of (x, y), i.e. of
+    grid[:y][:x], so there's an extra row and column of zeros at the start.
+    """
+    table = [array('q', [0] * (len(grid[0]) + 1))]
+    for row in grid:
+        running_total = 0
+        table_row = array('q', [0])
+        for above, val in zip(table[-1][1:], row):
+            running_total += val
+            table_row.append(above + running_total)
+        table.append(table_row)
+    return table
+
+
+def patch_power(table, x, y, patch_size=3):
+    """
+    Total power of the patch with its top left at (x, y), counting from 1, in O(1).
+    """
+    return (
+        table[y - 1 + patch_size][x - 1 + patch_size] - table[y - 1][x - 1 + patch_size]
+        - table[y - 1 + patch_size][x - 1] + table[y - 1][x - 1]
+    )
+
+
+def find_max_power_patch(grid, patch_size=3, table=None):
 
-    powers = {}
-    slicer = slice(None, -patch_size+1) if patch_size > 1 else slice(None, None)
+    if table is None:
+        table = summed_area_table(grid)
 
-    for y, row in enumerate(grid[slicer]):
-        for x, val in enumerate(row[slicer]):
-            patch = get_patch(grid, x+1, y+1, patch_size, patch_size)
-            powers[(x+1, y+1)] = get_total_power(patch)
+    max_power = None
+    max_power_loc = None
 
-    max_power_loc = dict_keymax(powers)
-    max_power = max(powers.values())
+    for y in range(len(table) - patch_size):
+        # Column totals over the rows of the patches starting on this row, then the patch totals are
+        # differences of those patch_size columns apart
+        strip = list(map(operator.sub, table[y + patch_size], table[y]))
+        powers = list(map(operator.sub, strip[patch_size:], strip))
+        row_max = max(powers)
+        if max_power is None or row_max > max_power:
+            max_power = row_max
+            max_power_loc = (powers.index(row_max) + 1, y + 1)
 
     return (max_power_loc[0], max_power_loc[1], patch_size), max_power
 
 
-def find_max_power_patch_any_size(grid):
+def _find_max_power_patches(args):
+    table, patch_sizes = args
+    return [find_max_power_patch(None, patch_size, table) for patch_size in patch_sizes]
+
+
+def find_max_power_patch_any_size(grid, jobs=1):
     """
-    This is super slow!
+    Try every patch size, splitting them between a process pool if jobs > 1.
     """
+    table = summed_area_table(grid)
+    patch_sizes = range(1, min(len(grid), len(grid[0])) + 1)
 
-    powers = Parallel(n_jobs=8)(
-        delayed(find_max_power_patch)(grid, patch_size)
-        for patch_size in tqdm(range(1, 301))
-    )
+    if jobs <= 1:
+        powers = _find_max_power_patches((table, patch_sizes))
+    else:
+        # Interleaved so each worker gets a fair share of the small (slow) and large (fast) sizes
+        tasks = [(table, patch_sizes[i::jobs]) for i in range(jobs)]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            powers = [power for chunk in executor.map(_find_max_power_patches, tasks) for power in chunk]
 
     max_power_config = max(powers, key=lambda x: x[1])
 
@@ -114,18 +141,20 @@ if __name__ == '__main__':
     loc1, pwr1 = find_max_power_patch(test_grid1, 16)
     assert (loc1[0], loc1[1]) == (90, 269) and pwr1 == 113
 
-    # cfg1, pwr1 = find_max_power_patch_any_size(test_grid1)
-    # assert cfg1 == (90,269,16) and pwr1 == 113
+    assert patch_power(summed_area_table(test_grid1), 90, 269, 16) == 113
+
+    cfg1, pwr1 = find_max_power_patch_any_size(test_grid1)
+    assert cfg1 == (90,269,16) and pwr1 == 113
 
     loc2, pwr2 = find_max_power_patch(test_grid2)
     assert (loc2[0], loc2[1]) == (21, 61) and pwr2 == 30
 
-    # cfg2, pwr2 = find_max_power_patch_any_size(test_grid2)
-    # assert cfg2 == (232,251,12) and pwr2 == 119
+    cfg2, pwr2 = find_max_power_patch_any_size(test_grid2, jobs=2)
+    assert cfg2 == (232,251,12) and pwr2 == 119
 
     grid = make_power_grid(300, 300, 7347)
     loc, pwr = find_max_power_patch(grid)
     print(f"Solution 1: ({loc[0]}, {loc[1]})  (power={pwr})")
 
-    cfg, pwr = find_max_power_patch_any_size(grid)
+    cfg, pwr = find_max_power_patch_any_size(grid, os.cpu_count() or 1)
     print(f"Solution 2: ({cfg[0]},{cfg[1]},{cfg[2]})  (power={pwr})")
@@ -4,6 +4,7 @@
 # 12/12/2018
 from collections import defaultdict
 from tqdm import tqdm
+from helper import read_input
 
 
 def parse_initial_state(state_spec):
@@ -128,8 +129,7 @@ if __name__ == '__main__':
 
     assert sum_plant_pot_nums(test_generations[-1]) == 325
 
-    with open('./data/day12_input.txt', 'r') as f:
-        input1 = f.read()
+    input1 = read_input(12)
     
     init_state, rules = parse_initial_state(input1)
     last_gen, gens = evolve_n_generations(init_state, rules, 20)
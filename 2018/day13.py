@@ -3,6 +3,8 @@
 # Michael Bell
 # 12/13/2018
 
+from helper import read_input
+
 turn_sequence = ['left', 'straight', 'right']
 directions = ['up', 'right', 'down', 'left']
 
@@ -174,8 +176,7 @@ if __name__ == '__main__':
 
     assert car_crash.x == 7 and car_crash.y == 3
 
-    with open('./data/day13_input.txt', 'r') as f:
-        input1 = f.read()
+    input1 = read_input(13)
 
     track, cars = parse_track_map(input1)
     car_crash = go_until_crash(cars, track)
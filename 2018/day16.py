@@ -3,6 +3,8 @@
 # Michael Bell
 # 12/16/2018
 
+from helper import read_input
+
 
 class Device(object):
     ops = [
@@ -161,8 +163,7 @@ def opcode_to_op(ops):
 
 if __name__ == '__main__':
 
-    with open('./data/day16_input.txt', 'r') as f:
-        input1 = f.read()
+    input1 = read_input(16)
 
     ops, prg = parse_tests(input1)
 
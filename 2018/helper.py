@@ -0,0 +1,21 @@
+import sys
+import os
+
+# Input loading is shared by every year, see aoc_input.py in the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aoc_input
+
+puzzle_year = int(os.path.basename(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _day(day_num):
+    return day_num or aoc_input.calling_solution()[1]
+
+def read_input(day_num=None):
+    return aoc_input.read_raw_input(puzzle_year, _day(day_num))
+
+def read_input_lines(day_num=None):
+    return aoc_input.read_input_lines(puzzle_year, _day(day_num))
+
+def read_bytes(day_num=None):
+    return aoc_input.read_bytes(puzzle_year, _day(day_num))
@@ -1,40 +1,61 @@
-from typing import List
+from typing import List, Optional, Tuple
 from itertools import permutations
-from day05 import IntcodeComputer, read_program
+from concurrent.futures import ProcessPoolExecutor
+from day05 import read_program
+from intcode import FastIntcodeComputer, IntcodeNetwork
+
+
+def amplifier_network(program: List[int], input_value: int, phases: List[int], feedback: bool,
+                      capacity: Optional[int]=None) -> IntcodeNetwork:
+
+    network = IntcodeNetwork([FastIntcodeComputer(program) for _ in phases], capacity)
+
+    for i, phase in enumerate(phases):
+        network.send(i, phase)
+        if i + 1 < len(phases):
+            network.connect(i, i + 1)
+    if feedback:
+        network.connect(len(phases) - 1, 0)
+    network.send(0, input_value)
+
+    return network
 
 
 def run_amplifiers(program: List[int], input_value: int, phases: List[int]) -> int:
 
-    amplifiers: List[IntcodeComputer] = [IntcodeComputer(program) for name in 'ABCDE']
+    network = amplifier_network(program, input_value, phases, feedback=False)
+    network.run()
+
+    return network.last_output[-1]
 
-    for phase, amp in zip(phases, amplifiers):
-        output = amp.run(phase, input_value)[0]
-        input_value = output
 
-    return output
+def run_amplifiers_with_feedback(program: List[int], input_value: int, phases: List[int],
+                                 capacity: Optional[int]=None) -> int:
 
+    network = amplifier_network(program, input_value, phases, feedback=True, capacity=capacity)
+    network.run()
 
-def run_amplifiers_with_feedback(program: List[int], input_value: int, phases: List[int]) -> int:
+    # The last amplifier's final output is sent back to the first one, which has halted by then
+    return network.last_output[-1]
 
-    amplifiers: List[IntcodeComputer] = [IntcodeComputer(program) for name in 'ABCDE']
-    program_state: List[int] = [-1 for name in 'ABCDE']  # -1 for not initialized, 0 for executing, 1 for done
 
-    while program_state[-1] <= 0:
-        for i, amp in enumerate(amplifiers):
-            if program_state[i] < 0:
-                output = amp.run_and_halt(phases[i], input_value)
-                program_state[i] = 0
-            elif program_state[i] == 0:
-                output = amp.run_and_halt(input_value)
-            else:
-                continue
-                
-            if output is not None:
-                input_value = output
-            else:
-                program_state[i] = 1
+def _run_phases(args: Tuple[List[int], Tuple[int, ...], bool]) -> Tuple[int, Tuple[int, ...]]:
+    program, phases, feedback = args
+    if feedback:
+        return run_amplifiers_with_feedback(program, 0, phases), phases
+    return run_amplifiers(program, 0, phases), phases
 
-    return input_value
+
+def max_amplifier_output(program: List[int], phase_settings: range, feedback: bool, jobs: int=1) -> Tuple[int, Tuple[int, ...]]:
+    """
+    Try every ordering of the phase settings, across a process pool if jobs > 1. Returns the best
+    output and the phases that produced it.
+    """
+    tasks = [(program, phases, feedback) for phases in permutations(phase_settings)]
+    if jobs <= 1:
+        return max(map(_run_phases, tasks))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return max(executor.map(_run_phases, tasks, chunksize=len(tasks) // jobs + 1))
 
 
 if __name__ == '__main__':
@@ -50,30 +71,21 @@ if __name__ == '__main__':
 
     test_program = [3,26,1001,26,-4,26,3,27,1002,27,2,27,1,27,26,27,4,27,1001,28,-1,28,1005,28,6,99,0,0,5]
     assert run_amplifiers_with_feedback(test_program, 0, [9,8,7,6,5]) == 139629729
+    # Room for the phase setting plus one signal in flight between amplifiers
+    assert run_amplifiers_with_feedback(test_program, 0, [9,8,7,6,5], capacity=2) == 139629729
 
     test_program = [3,52,1001,52,-5,52,3,53,1,52,56,54,1007,54,5,55,1005,55,26,1001,54,-5,54,1105,1,12,1,53,54,53,1008,54,0,55,1001,55,1,55,2,53,55,53,4,53,1001,56,-1,56,1005,56,6,99,0,0,0,0,10]
     assert run_amplifiers_with_feedback(test_program, 0, [9,7,8,5,6]) == 18216
+    assert run_amplifiers_with_feedback(test_program, 0, [9,7,8,5,6], capacity=2) == 18216
 
     amplifier_program = read_program('./inputs/day07.txt')
     
-    results = []
-    for phases in permutations(range(5)):
-
-        amp_output = run_amplifiers(amplifier_program, 0, phases)
-
-        results.append((phases, amp_output))
-
-    max_output_phases = max(results, key=lambda x: x[1])
-
-    print(f'Max output: {str(max_output_phases[1])} from phases {str(max_output_phases[0])}')
-
-    results = []
-    for phases in permutations(range(5, 10)):
+    max_output, max_output_phases = max_amplifier_output(amplifier_program, range(5), feedback=False)
 
-        amp_output = run_amplifiers_with_feedback(amplifier_program, 0, phases)
+    print(f'Max output: {max_output} from phases {max_output_phases}')
 
-        results.append((phases, amp_output))
+    max_output, max_output_phases = max_amplifier_output(amplifier_program, range(5, 10), feedback=True, jobs=4)
 
-    max_output_phases = max(results, key=lambda x: x[1])
+    print(f'Max output with feedback loop: {max_output} from phases {max_output_phases}')
 
-    print(f'Max output with feedback loop: {str(max_output_phases[1])} from phases {str(max_output_phases[0])}')
+    assert run_amplifiers_with_feedback(amplifier_program, 0, max_output_phases, capacity=2) == max_output
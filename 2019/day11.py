@@ -1,7 +1,8 @@
 from typing import List, DefaultDict, Tuple
 from collections import defaultdict
 from math import cos, sin, radians
-from day05 import IntcodeComputer, read_program
+from day05 import read_program
+from intcode import FastIntcodeComputer
 from day08 import print_image
 
 
@@ -28,7 +29,7 @@ def plot_panel_map(panel_map: DefaultDict[Tuple[int, int], int]) -> None:
 
 class PaintingRobot(object):
     def __init__(self, program: List[int]) -> None:
-        self.computer = IntcodeComputer(program)
+        self.computer = FastIntcodeComputer(program)
         self.x: int = 0
         self.y: int  = 0
         self.direction: int = 90
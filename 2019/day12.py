@@ -1,6 +1,7 @@
 from typing import List, Tuple
 from time import time
 from math import gcd
+from concurrent.futures import ProcessPoolExecutor
 
 
 class Moon(object):
@@ -137,6 +138,78 @@ def find_steps_to_repeat(moons: List[Moon]) -> int:
     return repeat_period
 
 
+def simulate_axis(positions: List[int], velocities: List[int], time_steps: int) -> None:
+    """
+    Advance one axis of the system in place. The axes don't interact, so each can be simulated on
+    its own.
+    """
+    n = len(positions)
+    for _ in range(time_steps):
+        for i in range(n):
+            position = positions[i]
+            for other in positions:
+                if other > position:
+                    velocities[i] += 1
+                elif other < position:
+                    velocities[i] -= 1
+        for i in range(n):
+            positions[i] += velocities[i]
+
+
+def axis_period(positions: List[int], velocities: List[int]) -> int:
+    """
+    Number of steps until one axis returns to its starting state. Starting from rest, the motion is
+    time reversible, so the first time the velocities are all zero again is halfway through the
+    period (or the end of it). This only has to simulate up to that point.
+    """
+    positions, velocities = list(positions), list(velocities)
+    if any(velocities):
+        # No symmetry to exploit, simulate until the full state comes back around
+        start = (tuple(positions), tuple(velocities))
+        t = 0
+        while True:
+            simulate_axis(positions, velocities, 1)
+            t += 1
+            if (tuple(positions), tuple(velocities)) == start:
+                return t
+
+    start = list(positions)
+    t = 0
+    while True:
+        simulate_axis(positions, velocities, 1)
+        t += 1
+        if not any(velocities):
+            # The period divides 2t and can't be shorter than t, so it's t if we're already back home
+            return t if positions == start else 2 * t
+
+
+class MoonSystem(object):
+    """
+    The moons stored axis by axis: positions[axis][moon] and velocities[axis][moon] for axes x, y, z.
+    """
+    def __init__(self, moons: List[Moon]) -> None:
+        self.positions = [[getattr(m, dim) for m in moons] for dim in 'xyz']
+        self.velocities = [[getattr(m, 'v_' + dim) for m in moons] for dim in 'xyz']
+
+    def simulate(self, time_steps: int) -> None:
+        for positions, velocities in zip(self.positions, self.velocities):
+            simulate_axis(positions, velocities, time_steps)
+
+    def moons(self) -> List[Moon]:
+        return [Moon(*position, *velocity) for position, velocity in zip(zip(*self.positions), zip(*self.velocities))]
+
+    def energy(self) -> int:
+        return sum(moon.energy() for moon in self.moons())
+
+    def steps_to_repeat(self, jobs: int=1) -> int:
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, 3)) as executor:
+                periods = list(executor.map(axis_period, self.positions, self.velocities))
+        else:
+            periods = [axis_period(p, v) for p, v in zip(self.positions, self.velocities)]
+        return lcm(periods[0], lcm(periods[1], periods[2]))
+
+
 if __name__ == '__main__':
 
     # Test
@@ -181,13 +254,18 @@ if __name__ == '__main__':
     test_period = find_steps_to_repeat(test_moons)
     assert test_period == 4686774924
 
+    # Test the axis by axis simulator against the above
+    test_system = MoonSystem(parse_positions(test_positions))
+    test_system.simulate(100)
+    assert test_system.energy() == 1940
+    assert MoonSystem(parse_positions(test_positions)).steps_to_repeat() == 4686774924
+
     # Part 1
-    moons = read_positions('./inputs/day12.txt')
-    simulate_motion(moons, 1000)
-    total_energy = sum(moon.energy() for moon in moons)
-    print(f"Total energy after 1000 time steps: {total_energy}")
+    system = MoonSystem(read_positions('./inputs/day12.txt'))
+    system.simulate(1000)
+    print(f"Total energy after 1000 time steps: {system.energy()}")
 
     # Part 2
-    moons = read_positions('./inputs/day12.txt')
-    repeat_period = find_steps_to_repeat(moons)
+    system = MoonSystem(read_positions('./inputs/day12.txt'))
+    repeat_period = system.steps_to_repeat(jobs=3)
     print(f'Steps required to find a repeated state: {repeat_period}')
@@ -1,5 +1,6 @@
 from typing import List, Tuple, Any
-from day05 import IntcodeComputer, read_program
+from day05 import read_program
+from intcode import FastIntcodeComputer
 import curses
 import time
 import sys
@@ -25,7 +26,7 @@ class ArcadeCabinet(object):
         self.score: int = 0
         self.paddle_x_position = -1
         self.ball_x_position = -1
-        self.computer = IntcodeComputer(tmp)
+        self.computer = FastIntcodeComputer(tmp)
         self.screen = screen
         initial_screen = self.computer.run_until_input_required()
         self.render_screen(initial_screen)
@@ -97,7 +98,7 @@ def main(screen: Any, bot_player: bool):
 if __name__ == '__main__':
 
     program = read_program('./inputs/day13.txt')
-    computer = IntcodeComputer(program)
+    computer = FastIntcodeComputer(program)
     output = computer.run()
     print(f"Number of block tiles: {sum([1 for i in range(2, len(output), 3) if output[i] == 2])}")
 
@@ -1,6 +1,7 @@
 from typing import List, Dict, Tuple, Any
-from day05 import IntcodeComputer, read_program
-from collections import defaultdict
+from day05 import read_program
+from intcode import FastIntcodeComputer
+from collections import defaultdict, deque
 import sys
 import curses
 import random
@@ -104,6 +105,40 @@ def destination_coordinate(current_coordinate: Tuple[int, int], direction: int)
         raise ValueError(f'Ivalid direction {direction} given')
 
 
+def explore_maze(program: List[int]) -> Tuple[Dict[Tuple[int, int], str], int]:
+    '''
+    Map the whole maze with a breadth first search over robot states. The robot's computer is forked 
+    at every open location so each branch continues from there instead of wandering back. Returns 
+    the maze map and the fewest steps from the start to the goal.
+    '''
+    maze_map: Dict[Tuple[int, int], str] = defaultdict(lambda: UNKNOWN)
+    maze_map[(0, 0)] = START
+    steps_to_goal = None
+
+    frontier = deque([((0, 0), FastIntcodeComputer(program), 0)])
+    while frontier:
+        current_location, robot, steps = frontier.popleft()
+        for direction in [NORTH, SOUTH, WEST, EAST]:
+            destination = destination_coordinate(current_location, direction)
+            if maze_map[destination] != UNKNOWN:
+                continue
+
+            branch = robot.fork()
+            status = branch.run_until_input_required(direction)[0]
+            if status == HIT_WALL:
+                maze_map[destination] = WALL
+                continue
+
+            if status == FOUND_GOAL:
+                maze_map[destination] = GOAL
+                steps_to_goal = steps + 1
+            else:
+                maze_map[destination] = PATH
+            frontier.append((destination, branch, steps + 1))
+
+    return maze_map, steps_to_goal
+
+
 def render_scene(screen: Any, current_location: Tuple[int, int], maze_map: Dict[Tuple[int, int], str]) -> None:
 
     screen_left_edge = int(current_location[0] - NX / 2)
@@ -159,7 +194,7 @@ def main_rendered(screen: Any, program: List[int]) -> None:
     exploration_history[current_location] += 1
     maze_map[current_location] = START
 
-    robot = IntcodeComputer(program)
+    robot = FastIntcodeComputer(program)
 
     steps = 0
 
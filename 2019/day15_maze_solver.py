@@ -1,5 +1,6 @@
 from typing import List, Dict, Tuple, Any
-from day05 import IntcodeComputer, read_program
+from day05 import read_program
+from intcode import FastIntcodeComputer
 from collections import defaultdict
 import sys
 import curses
@@ -117,7 +118,7 @@ def main_rendered(screen: Any, program: List[int]) -> None:
     exploration_history[current_location] += 1
     maze_map[current_location] = START
 
-    robot = IntcodeComputer(program)
+    robot = FastIntcodeComputer(program)
 
     while status != FOUND_GOAL:
 
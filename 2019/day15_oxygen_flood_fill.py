@@ -101,6 +101,25 @@ def get_edge_coordinates(maze_map: Dict[Tuple[int, int], str]) -> List[Tuple[int
     return edge_coordinates
 
 
+def minutes_to_fill(maze_map: Dict[Tuple[int, int], str]) -> int:
+    '''
+    Same answer as the rendered flood fill, as a plain breadth first search out from the goal.
+    '''
+    seed_location = [k for k in maze_map if maze_map[k] == GOAL][0]
+    minutes = {seed_location: 0}
+    frontier = [seed_location]
+    while frontier:
+        next_frontier = []
+        for location in frontier:
+            for direction in [NORTH, SOUTH, EAST, WEST]:
+                neighbor = destination_coordinate(location, direction)
+                if neighbor not in minutes and maze_map.get(neighbor, UNKNOWN) not in (WALL, UNKNOWN):
+                    minutes[neighbor] = minutes[location] + 1
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return max(minutes.values())
+
+
 def main_rendered(screen: Any, filename: str) -> None:
     '''
     Navigate through the maze to find the end and display progress on screen.
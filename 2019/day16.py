@@ -1,4 +1,6 @@
 from typing import List, Dict, Any
+from itertools import accumulate
+from operator import mul
 import math
 
 
@@ -34,29 +36,87 @@ def ones_digit(value: int) -> int:
     return int(str(value)[-1])
 
 
-def FFT(signal: List[int], n_phases: int, verbose: bool=False) -> List[int]:
-
-    base_pattern = [0, 1, 0, -1]
+def fft_phase(signal: List[int]) -> List[int]:
+    """
+    One FFT phase using range sums over a prefix sum of the signal. Output position i only needs
+    the sums of the runs of i + 1 values under the +1s and -1s of its pattern, so the phase costs 
+    n/1 + n/2 + ... + n/n range sums, O(n log n) overall, instead of n^2 multiplications.
+    """
+    n = len(signal)
+    prefix = [0]
+    prefix.extend(accumulate(signal))
+
+    output_signal = []
+    for i in range(n):
+        run_length = i + 1
+        total = 0
+        # The first +1 run starts at index i, then the pattern repeats every 4 runs
+        for start in range(i, n, 4 * run_length):
+            total += prefix[min(start + run_length, n)] - prefix[start]
+            negative_start = start + 2 * run_length
+            if negative_start < n:
+                total -= prefix[min(negative_start + run_length, n)] - prefix[negative_start]
+        output_signal.append(abs(total) % 10)
+    return output_signal
 
-    phase_input_signal = signal.copy()
 
-    for phase in range(n_phases):
+def FFT(signal: List[int], n_phases: int, verbose: bool=False) -> List[int]:
 
-        output_signal = []
+    output_signal = signal.copy()
 
-        for i in range(len(phase_input_signal)):
+    for phase in range(n_phases):
 
-            result = apply_pattern(base_pattern, phase_input_signal, i)
-            output_signal.append(ones_digit(result))
+        output_signal = fft_phase(output_signal)
 
         if verbose and (phase + 1) % 10 == 0:
             print(f'Phase {phase + 1}')
 
-        phase_input_signal = output_signal.copy()
-
     return output_signal
 
 
+def binomial_mod_prime(n: int, k: int, p: int) -> int:
+    """
+    n choose k mod a small prime p, by Lucas' theorem (multiply the binomials of the base p digits).
+    """
+    result = 1
+    while n or k:
+        n_digit, k_digit = n % p, k % p
+        if k_digit > n_digit:
+            return 0
+        result = result * math.comb(n_digit, k_digit) % p
+        n //= p
+        k //= p
+    return result
+
+
+def decode_message(signal: List[int], n_phases: int=100, repeats: int=10000) -> List[int]:
+    """
+    Part 2: the message offset is always in the second half of the repeated signal. Past the 
+    halfway point every pattern is 0s up to the position followed by nothing but 1s, so a phase 
+    just replaces each digit with the sum of the digits from there to the end. Applying that 
+    n_phases times weights the digit j places further along by (j + n_phases - 1 choose j), so
+    each message digit is one weighted sum over the suffix, with the weights taken mod 10 
+    (mod 2 and mod 5 via Lucas' theorem, combined with the Chinese remainder theorem).
+    """
+    offset = int(''.join(str(v) for v in signal[:7]))
+    total_length = len(signal) * repeats
+    if offset < total_length // 2:
+        raise ValueError(f'Message offset {offset} is not in the second half of the signal')
+
+    # Only the suffix from the offset onward affects the message
+    suffix_length = total_length - offset
+    suffix = (signal * (suffix_length // len(signal) + 1))[-suffix_length:]
+
+    weights = []
+    for j in range(suffix_length):
+        # Lucas for p = 2 boils down to: odd exactly when j and n_phases - 1 share no bits
+        mod_2 = 1 if j & (n_phases - 1) == 0 else 0
+        mod_5 = binomial_mod_prime(j + n_phases - 1, j, 5)
+        weights.append((5 * mod_2 + 6 * mod_5) % 10)
+
+    return [sum(map(mul, weights, suffix[k:])) % 10 for k in range(8)]
+
+
 def lists_equal(list1: List[Any], list2: List[Any]) -> bool:
     if len(list1) != len(list2):
         return False
@@ -82,3 +142,11 @@ if __name__ == '__main__':
     result = FFT(signal, 100, True)
 
     print(f'Result: {"".join([str(v) for v in result[:8]])}')
+
+    assert lists_equal(decode_message(parse_signal('03036732577212944063491565474664')), parse_signal('84462026'))
+    assert lists_equal(decode_message(parse_signal('02935109699940807407585447034323')), parse_signal('78725270'))
+    assert lists_equal(decode_message(parse_signal('03081770884921959731165446850517')), parse_signal('53553731'))
+
+    message = decode_message(signal)
+
+    print(f'Message: {"".join([str(v) for v in message])}')
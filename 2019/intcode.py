@@ -0,0 +1,322 @@
+from typing import Callable, Deque, List, NamedTuple, Optional, Tuple
+from collections import deque
+
+
+# Every valid instruction value (opcode plus up to three parameter modes) decoded once up front,
+# so executing an instruction never has to pick apart the opcode again
+OPCODES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 99)
+DECODE: List[Optional[Tuple[int, int, int, int]]] = [None] * 30000
+for _value in range(len(DECODE)):
+    _modes = (_value // 100 % 10, _value // 1000 % 10, _value // 10000 % 10)
+    if _value % 100 in OPCODES and all(mode <= 2 for mode in _modes):
+        DECODE[_value] = (_value % 100, *_modes)
+
+N_PARAMETERS = {1: 3, 2: 3, 3: 1, 4: 1, 5: 2, 6: 2, 7: 3, 8: 3, 9: 1, 99: 0}
+
+# Memory is grown a page at a time when the program touches an address past its end
+PAGE_SIZE = 1024
+
+HALTED = 0
+NEEDS_INPUT = 1
+PRODUCED_OUTPUT = 2
+
+
+def _operand(offset: int, mode: int) -> str:
+    return ('m[m[ip + {0}]]', 'm[ip + {0}]', 'm[m[ip + {0}] + base]')[mode].format(offset)
+
+
+def _address(offset: int, mode: int) -> str:
+    return f'm[ip + {offset}] + base' if mode == 2 else f'm[ip + {offset}]'
+
+
+def compile_instruction(value: int) -> Optional[Callable[[List[int], int, int], int]]:
+    """
+    Build a function specialised to one instruction value (opcode and modes fixed) that 
+    executes it and returns the next instruction pointer. Only the pure compute and jump 
+    instructions are compiled, I/O, relative base changes and halting stay in the main loop.
+    Operands are still read from memory at run time, so self-modifying programs work.
+    """
+    op, m1, m2, m3 = DECODE[value]
+    if op in (1, 2, 7, 8):
+        expression = {
+            1: '{a} + {b}', 
+            2: '{a} * {b}', 
+            7: '1 if {a} < {b} else 0', 
+            8: '1 if {a} == {b} else 0',
+        }[op].format(a=_operand(1, m1), b=_operand(2, m2))
+        body = f'm[{_address(3, m3)}] = {expression}\n    return ip + 4'
+    elif op in (5, 6):
+        comparison = '!=' if op == 5 else '=='
+        body = f'return {_operand(2, m2)} if {_operand(1, m1)} {comparison} 0 else ip + 3'
+    else:
+        return None
+    namespace = {}
+    exec(f'def instruction_{value}(m, ip, base):\n    {body}\n', namespace)
+    return namespace[f'instruction_{value}']
+
+
+# Compiled lazily and shared by every computer, there are only a few dozen distinct values in practice
+COMPILED: List[Optional[Callable[[List[int], int, int], int]]] = [None] * len(DECODE)
+
+
+def _is_valid(value: int) -> bool:
+    return 0 <= value < len(DECODE) and DECODE[value] is not None
+
+
+class IntcodeSnapshot(NamedTuple):
+    memory: List[int]
+    instruction_pointer: int
+    relative_base: int
+
+
+class FastIntcodeComputer(object):
+    """
+    Drop-in replacement for day05.IntcodeComputer with the same run, run_and_halt and
+    run_until_input_required methods. Instructions are dispatched straight from their value
+    to a compiled function (or handled inline) and memory is a flat list grown in pages.
+    """
+
+    def __init__(self, initial_memory: List[int]) -> None:
+        self.initial_memory = list(initial_memory)
+        self.reset()
+
+    def reset(self) -> None:
+        self.memory = self.initial_memory.copy()
+        self.instruction_pointer = 0
+        self.relative_base = 0
+        # Set when memory may be referenced by a snapshot or forked computer, it's copied before the next write
+        self.memory_shared = False
+
+    def snapshot(self) -> IntcodeSnapshot:
+        """
+        Capture the current state without copying anything. Memory is shared until this computer
+        runs again, at which point it takes its own copy.
+        """
+        self.memory_shared = True
+        return IntcodeSnapshot(self.memory, self.instruction_pointer, self.relative_base)
+
+    def restore(self, snapshot: IntcodeSnapshot) -> None:
+        self.memory = snapshot.memory
+        self.instruction_pointer = snapshot.instruction_pointer
+        self.relative_base = snapshot.relative_base
+        self.memory_shared = True
+
+    def fork(self) -> 'FastIntcodeComputer':
+        """
+        Return an independent computer in the same state as this one, e.g. to branch a search
+        at each decision point instead of replaying inputs from the start.
+        """
+        child = FastIntcodeComputer.__new__(FastIntcodeComputer)
+        child.initial_memory = self.initial_memory
+        child.restore(self.snapshot())
+        return child
+
+    def _grow(self, instruction_pointer: int, relative_base: int) -> bool:
+        """
+        Extend memory to cover every address the instruction at instruction_pointer can touch.
+        Returns False if memory was already big enough (so the IndexError wasn't ours to fix).
+        """
+        memory = self.memory
+        addresses = [instruction_pointer + 3]
+        decoded = None
+        if instruction_pointer < len(memory) and 0 <= memory[instruction_pointer] < len(DECODE):
+            decoded = DECODE[memory[instruction_pointer]]
+        if decoded is not None:
+            for offset, mode in enumerate(decoded[1:N_PARAMETERS[decoded[0]] + 1], 1):
+                if mode != 1 and instruction_pointer + offset < len(memory):
+                    value = memory[instruction_pointer + offset]
+                    addresses.append(value + relative_base if mode == 2 else value)
+        needed = max(addresses) + 1
+        if needed <= len(memory):
+            return False
+        memory.extend([0] * ((needed - len(memory)) // PAGE_SIZE * PAGE_SIZE + PAGE_SIZE))
+        return True
+
+    def _execute(self, inputs: List[int], outputs: List[int], max_outputs: Optional[int]=None) -> Tuple[int, int]:
+        """
+        Run until the program halts, needs more input than given or has produced max_outputs values.
+        Returns the status and how many of the inputs were consumed.
+        """
+        if self.memory_shared:
+            self.memory = self.memory.copy()
+            self.memory_shared = False
+        memory = self.memory
+        compiled = COMPILED
+        ip = self.instruction_pointer
+        base = self.relative_base
+        n_inputs = len(inputs)
+        input_index = 0
+
+        status = None
+        while status is None:
+            try:
+                while True:
+                    value = memory[ip]
+                    # Negative values would index COMPILED from the end, leave them for the check below
+                    instruction = compiled[value] if value >= 0 else None
+                    if instruction is not None:
+                        ip = instruction(memory, ip, base)
+                        continue
+
+                    if not _is_valid(value):
+                        raise ValueError(f'Invalid instruction {value} at address {ip}')
+                    op, m1, _, _ = DECODE[value]
+
+                    if op == 9:
+                        a = memory[ip + 1]
+                        if m1 == 0:
+                            a = memory[a]
+                        elif m1 == 2:
+                            a = memory[a + base]
+                        base += a
+                        ip += 2
+
+                    elif op == 3:
+                        if input_index == n_inputs:
+                            status = NEEDS_INPUT
+                            break
+                        c = memory[ip + 1]
+                        if m1 == 2:
+                            c += base
+                        memory[c] = inputs[input_index]
+                        input_index += 1
+                        ip += 2
+
+                    elif op == 4:
+                        a = memory[ip + 1]
+                        if m1 == 0:
+                            a = memory[a]
+                        elif m1 == 2:
+                            a = memory[a + base]
+                        outputs.append(a)
+                        ip += 2
+                        if len(outputs) == max_outputs:
+                            status = PRODUCED_OUTPUT
+                            break
+
+                    elif op == 99:
+                        status = HALTED
+                        break
+
+                    else:
+                        compiled[value] = compile_instruction(value)
+
+            except IndexError:
+                # Values too far out of range to look up in COMPILED end up here rather than in the main loop
+                if 0 <= ip < len(memory) and not _is_valid(memory[ip]):
+                    raise ValueError(f'Invalid instruction {memory[ip]} at address {ip}') from None
+                # Every instruction does its reads before any state changes, so it's safe to retry
+                if not self._grow(ip, base):
+                    raise
+
+        self.instruction_pointer = ip
+        self.relative_base = base
+        return status, input_index
+
+    def run(self, *inputs: int) -> List[int]:
+        """
+        Run the program until opcode 99 is reached. Return all outputs produced as a list of integers.
+        """
+        self.reset()
+        outputs = []
+        if self._execute(list(inputs), outputs)[0] == NEEDS_INPUT:
+            raise IndexError('Program requires more inputs than were provided')
+        return outputs
+
+    def run_and_halt(self, *inputs: int) -> Optional[int]:
+        """
+        Run the program until it produces output at which time it will return the output and halt execution.
+        Program state and instruction pointer is maintained between calls. When opcode 99 is reached (program is terminated)
+        this method will return None.
+        """
+        outputs = []
+        status, _ = self._execute(list(inputs), outputs, 1)
+        if status == NEEDS_INPUT:
+            raise IndexError('Program requires more inputs than were provided')
+        return outputs[0] if status == PRODUCED_OUTPUT else None
+
+    def run_until_input_required(self, input_value: int=None) -> Optional[List[int]]:
+        """
+        Run the program until it requires input at which time it will return the output and halt execution.
+        Program state and instruction pointer is maintained between calls. When opcode 99 is reached (program is terminated)
+        this method will return None.
+        """
+        outputs = []
+        inputs = [input_value] if input_value is not None else []
+        status, _ = self._execute(inputs, outputs)
+        if status == HALTED and len(outputs) == 0:
+            return None
+        return outputs
+
+
+class IntcodeNetwork(object):
+    """
+    Cooperative scheduler for any number of connected Intcode computers. Each computer has an input
+    channel; connect() pipes one computer's outputs into another's channel, and anything a computer
+    outputs with nowhere to go is collected in outputs. run() takes turns in index order, letting each 
+    computer run until it blocks (needs input it doesn't have, or its destination channel is full), 
+    so the result is deterministic and doesn't depend on thread or event loop timing.
+    """
+
+    def __init__(self, computers: List[FastIntcodeComputer], capacity: Optional[int]=None) -> None:
+        self.computers = computers
+        self.capacity = capacity
+        self.channels: List[Deque[int]] = [deque() for _ in computers]
+        self.destinations: List[Optional[int]] = [None for _ in computers]
+        self.outputs: List[List[int]] = [[] for _ in computers]
+        self.last_output: List[Optional[int]] = [None for _ in computers]
+        self.halted: List[bool] = [False for _ in computers]
+
+    def connect(self, source: int, destination: int) -> None:
+        self.destinations[source] = destination
+
+    def send(self, destination: int, *values: int) -> None:
+        self.channels[destination].extend(values)
+
+    def _room(self, index: int) -> Optional[int]:
+        destination = self.destinations[index]
+        if self.capacity is None or destination is None:
+            return None
+        return self.capacity - len(self.channels[destination])
+
+    def step(self, index: int) -> bool:
+        """
+        Give computer index a turn. Returns True if it made progress (consumed input, produced output
+        or halted).
+        """
+        if self.halted[index]:
+            return False
+        room = self._room(index)
+        if room is not None and room <= 0:
+            return False
+
+        channel = self.channels[index]
+        inputs = list(channel)
+        outputs = []
+        status, consumed = self.computers[index]._execute(inputs, outputs, room)
+        for _ in range(consumed):
+            channel.popleft()
+
+        if outputs:
+            self.last_output[index] = outputs[-1]
+            if self.destinations[index] is None:
+                self.outputs[index].extend(outputs)
+            else:
+                self.channels[self.destinations[index]].extend(outputs)
+        if status == HALTED:
+            self.halted[index] = True
+            return True
+        return consumed > 0 or len(outputs) > 0
+
+    def run(self) -> bool:
+        """
+        Run until every computer has halted (returns True) or none of them can make progress, i.e. they 
+        are all waiting on input nobody is going to send (returns False).
+        """
+        while not all(self.halted):
+            progress = False
+            for index in range(len(self.computers)):
+                progress = self.step(index) or progress
+            if not progress:
+                return False
+        return True
@@ -2,20 +2,19 @@ from typing import List
 import sys    
 import os    
 
+# Input loading is shared by every year, see aoc_input.py in the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aoc_input
 
-calling_file_name =  os.path.basename(sys.argv[0])
-puzzle_day = int(calling_file_name.replace('day', '').replace('.py', ''))
+puzzle_year = int(os.path.basename(os.path.dirname(os.path.abspath(__file__))))
 
 
 def read_input(day_num: int=None) -> str:
     if not day_num:
-        day_num = puzzle_day
-    with open('./inputs/day{:>02}.txt'.format(day_num), 'r') as f:
-        contents = f.read()
-    return contents.strip()
+        day_num = aoc_input.calling_solution()[1]
+    return aoc_input.read_input(puzzle_year, day_num).strip()
 
 def read_input_lines(day_num: int=None) -> List[str]:
     if not day_num:
-        day_num = puzzle_day
-    contents = read_input(day_num)
-    return [c for c in contents.split('\n') if c.strip()]
+        day_num = aoc_input.calling_solution()[1]
+    return aoc_input.read_input_lines(puzzle_year, day_num)
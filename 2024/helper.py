@@ -1,25 +1,31 @@
-from typing import List, Union
+from typing import List, Tuple, Union
 import sys    
 import os    
 
+# Input loading is shared by every year, see aoc_input.py in the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aoc_input
 
-calling_file_name = os.path.basename(sys.argv[0])
-calling_file_path = os.path.dirname(os.path.abspath(sys.argv[0]))
-puzzle_day = int(calling_file_name.replace('day', '').replace('.py', ''))
+puzzle_year = int(os.path.basename(os.path.dirname(os.path.abspath(__file__))))
 
 
+def _day(day_num: Union[int, None]) -> int:
+    return day_num or aoc_input.calling_solution()[1]
+
 def read_input(day_num: Union[int, None]=None) -> str:
-    if not day_num:
-        day_num = puzzle_day
-    with open(os.path.join(calling_file_path, './inputs/day{:>02}.txt'.format(day_num)), 'r') as f:
-        contents = f.read()
-    return contents.rstrip()
+    return aoc_input.read_input(puzzle_year, _day(day_num))
 
 def read_input_lines(day_num: Union[int, None]=None) -> List[str]:
-    if not day_num:
-        day_num = puzzle_day
-    contents = read_input(day_num)
-    return [c for c in contents.split('\n') if c.strip()]
+    return aoc_input.read_input_lines(puzzle_year, _day(day_num))
+
+def read_blocks(day_num: Union[int, None]=None) -> Tuple[Tuple[str, ...], ...]:
+    return aoc_input.read_blocks(puzzle_year, _day(day_num))
+
+def read_ints(day_num: Union[int, None]=None) -> Tuple[int, ...]:
+    return aoc_input.read_ints(puzzle_year, _day(day_num))
+
+def read_int_grid(day_num: Union[int, None]=None) -> Tuple[Tuple[int, ...], ...]:
+    return aoc_input.read_int_grid(puzzle_year, _day(day_num))
 
 def check(ans: int, expected: int):
     assert ans == expected, f'Expected: {expected}, got: {ans}'
\ No newline at end of file
@@ -2,9 +2,27 @@
 CLI for AOC
 '''
 import datetime
-from urllib import request
+from urllib import parse, request
+from typing import Any, Dict, List, Optional
 import argparse
+import http.client
+import ast
+import contextlib
+import importlib.util
+import io
+import json
 import os, sys
+import platform
+import re
+import runpy
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 base_path = os.path.dirname(os.path.abspath(__file__))
 
 cookie = os.environ.get('AOC_COOKIE')
@@ -13,9 +31,14 @@ def get_today():
     return datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=-5), 'EST'))
 
 
+def days_in_year(year: int) -> int:
+    # Advent of Code went from 25 puzzles a year to 12 in 2025
+    return 25 if year < 2025 else 12
+
+
 def valid_date(year: int, day: int) -> bool:
     today = get_today()
-    return (2015 <= year <= today.year) and (
+    return (2015 <= year <= today.year) and (1 <= day <= days_in_year(year)) and (
             (year < today.year) or 
         (today.month == 12 and day <= today.day)
     )
@@ -52,6 +75,136 @@ def download_puzzle_input(year: int, day: int) -> str:
     return filepath
 
 
+class RateLimiter:
+    # Spaces request start times at least 1 / requests_per_second apart across all threads
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start_time = max(now, self.next_time)
+            self.next_time = start_time + self.interval
+        time.sleep(max(0.0, start_time - now))
+
+
+class InputFetcher:
+    '''
+    Bulk puzzle input downloader. Each worker thread keeps a persistent connection, 
+    requests are rate limited to be polite to the AoC servers, and ETags are kept so 
+    that refreshing existing inputs is a cheap conditional request.
+    '''
+    def __init__(self, base_url: str='https://adventofcode.com', cookie: Optional[str]=cookie, 
+                 requests_per_second: float=1.0, root_path: str=base_path):
+        url = parse.urlsplit(base_url)
+        self.connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        self.host = url.netloc
+        self.path_prefix = url.path.rstrip('/')
+        self.cookie = cookie
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.root_path = root_path
+        self.etag_path = os.path.join(root_path, '.input_etags.json')
+        self.etags = {}
+        if os.path.exists(self.etag_path):
+            with open(self.etag_path, 'r') as f:
+                self.etags = json.load(f)
+        self.etag_lock = threading.Lock()
+        self.local = threading.local()
+        self.connections = []
+
+    def input_filepath(self, year: int, day: int) -> str:
+        return os.path.join(self.root_path, f'{year}', 'inputs', f'day{day:>02}.txt')
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.connection_class(self.host, timeout=30)
+            self.local.connection = connection
+            with self.etag_lock:
+                self.connections.append(connection)
+        return connection
+
+    def _get(self, path: str, headers: Dict[str, str]) -> tuple:
+        for attempt in range(2):
+            # Retries count against the rate limit too
+            self.rate_limiter.wait()
+            connection = self._connection()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.getheader('ETag'), response.read()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionError):
+                # The server dropped our kept-alive connection, reconnect once
+                connection.close()
+                self.local.connection = None
+                if attempt:
+                    raise
+
+    def fetch(self, year: int, day: int, refresh: bool=False) -> str:
+        filepath = self.input_filepath(year, day)
+        path = f'{self.path_prefix}/{year}/day/{day}/input'
+        etag = self.etags.get(path)
+        if os.path.exists(filepath) and not (refresh and etag):
+            return 'exists'
+
+        headers = {
+            'User-Agent' : 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:94.0) Gecko/20100101 Firefox/94.0',
+            'Cookie': self.cookie or '',
+        }
+        if etag and os.path.exists(filepath):
+            headers['If-None-Match'] = etag
+
+        status, new_etag, body = self._get(path, headers)
+        if status == 304:
+            return 'not modified'
+
+        contents = body.decode('utf-8')
+        if 'Please log in' in contents:
+            raise PermissionError('Must be logged in at https://adventofcode.com to use the aoc cli.')
+        elif status == 404 or '404 Not Found' in contents:
+            raise FileNotFoundError(f'Input not found for {path}.')
+        elif status != 200:
+            raise IOError(f'Unexpected response {status} for {path}.')
+
+        # Write then rename so an interrupted download never leaves a partial input behind
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_filepath = f'{filepath}.{threading.get_ident()}.tmp'
+        with open(tmp_filepath, 'w') as f:
+            f.write(contents)
+        os.replace(tmp_filepath, filepath)
+
+        if new_etag:
+            with self.etag_lock:
+                self.etags[path] = new_etag
+        return 'downloaded'
+
+    def fetch_all(self, targets: List[tuple], jobs: int=4, refresh: bool=False, on_result=None) -> Dict[tuple, str]:
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = {executor.submit(self.fetch, year, day, refresh): (year, day) for year, day in targets}
+                for future in as_completed(futures):
+                    try:
+                        results[futures[future]] = future.result()
+                    except Exception as e:
+                        results[futures[future]] = f'error: {e}'
+                    if on_result:
+                        on_result(futures[future], results[futures[future]])
+        finally:
+            for connection in self.connections:
+                connection.close()
+            self.save_etags()
+        return results
+
+    def save_etags(self):
+        tmp_filepath = self.etag_path + '.tmp'
+        with open(tmp_filepath, 'w') as f:
+            json.dump(self.etags, f, indent=2, sort_keys=True)
+        os.replace(tmp_filepath, self.etag_path)
+
+
 def create_py_file_template(year: int, day: int) -> str:
     with open(os.path.join(base_path, 'pyfile.template'), 'r') as f:
         file_template = f.read()
@@ -65,6 +218,290 @@ def create_py_file_template(year: int, day: int) -> str:
     return filepath
 
 
+def parse_years(spec: str) -> List[int]:
+    # Accepts a single year (2019), a range (2015..2025) or a comma separated list (2015,2017)
+    years = []
+    for chunk in spec.split(','):
+        if '..' in chunk:
+            start, end = chunk.split('..')
+            years.extend(range(int(start), int(end) + 1))
+        else:
+            years.append(int(chunk))
+    return years
+
+
+def solution_path(year: int, day: int) -> str:
+    return os.path.join(base_path, f'{year}', f'day{day:>02}.py')
+
+
+def find_solutions(years: List[int], days: Optional[List[int]]=None) -> List[tuple]:
+    days = days or list(range(1, 26))
+    return [
+        (year, day) for year in years for day in days 
+        if os.path.exists(solution_path(year, day))
+    ]
+
+
+def reset_peak_rss() -> bool:
+    # Linux lets a process reset its own peak RSS (VmHWM), so solutions sharing a process can each
+    # be measured on their own. Returns False where that isn't possible.
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_kb() -> Optional[int]:
+    # Peak since the last reset_peak_rss(), or since the process started if it couldn't be reset
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes everywhere else
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.If) and isinstance(node.test, ast.Compare) and
+        isinstance(node.test.left, ast.Name) and node.test.left.id == '__name__'
+    )
+
+
+def _reads_puzzle_input(node: ast.stmt) -> bool:
+    if not (isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == 'puzzle_input' for t in node.targets)):
+        return False
+    return any(
+        isinstance(n, ast.Attribute) and n.attr.startswith('read_input') 
+        for n in ast.walk(node.value)
+    )
+
+
+def _part_expression(node: ast.stmt) -> Optional[tuple]:
+    # Matches the template's `print(f'Part 1: {part1(puzzle_input)}')` lines
+    if not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call) and 
+            isinstance(node.value.func, ast.Name) and node.value.func.id == 'print' and 
+            len(node.value.args) == 1 and isinstance(node.value.args[0], ast.JoinedStr)):
+        return None
+    values = node.value.args[0].values
+    if not (len(values) >= 2 and isinstance(values[0], ast.Constant) and isinstance(values[1], ast.FormattedValue)):
+        return None
+    match = re.match(r'Part (\d+):', str(values[0].value))
+    if match is None:
+        return None
+    return int(match.group(1)), ast.Expression(values[1].value)
+
+
+def plan_solution(source: str) -> Optional[List[tuple]]:
+    '''
+    Split the "real thing" section of a solution's __main__ block into steps that can 
+    be run (and timed) in-process: ('setup', code) for input reading and parsing, and 
+    ('part', n, code) for each answer expression. Returns None if the file doesn't 
+    follow the template layout.
+    '''
+    tree = ast.parse(source)
+    main_blocks = [node for node in tree.body if _is_main_guard(node)]
+    if not main_blocks:
+        return None
+    body = main_blocks[-1].body
+    start = next((i for i, node in enumerate(body) if _reads_puzzle_input(node)), None)
+    if start is None:
+        return None
+
+    steps = []
+    for node in body[start:]:
+        part = _part_expression(node)
+        if part is not None:
+            part_num, expression = part
+            steps.append(('part', part_num, compile(expression, '<aoc run>', 'eval')))
+        else:
+            steps.append(('setup', compile(ast.Module([node], []), '<aoc run>', 'exec')))
+    if not any(step[0] == 'part' for step in steps):
+        return None
+    return steps
+
+
+@contextlib.contextmanager
+def solution_context(year: int, day: int):
+    # Emulate `cd YEAR && python dayNN.py`: helpers and sibling imports (`from day05 import ...`)
+    # resolve against the year directory, and inputs are read relative to it
+    year_path = os.path.join(base_path, f'{year}')
+    saved_cwd, saved_path, saved_argv = os.getcwd(), list(sys.path), list(sys.argv)
+    saved_modules = set(sys.modules)
+    os.chdir(year_path)
+    sys.path.insert(0, year_path)
+    sys.argv = [solution_path(year, day)]
+    try:
+        yield year_path
+    finally:
+        os.chdir(saved_cwd)
+        sys.path[:] = saved_path
+        sys.argv = saved_argv
+        # Every year has its own `helper` and `dayNN` modules, so don't let them leak
+        for name in set(sys.modules) - saved_modules:
+            module_file = getattr(sys.modules[name], '__file__', None) or ''
+            if module_file.startswith(year_path + os.sep):
+                del sys.modules[name]
+
+
+def _answer(value: Any) -> Any:
+    if value is None or isinstance(value, (int, float, str)):
+        return value if value != '' else None
+    return repr(value)
+
+
+def _scrape_answers(output: str) -> Dict[str, str]:
+    answers = {}
+    for line in output.splitlines():
+        match = re.match(r'\s*(?:part|solution)\s*(\d)\b[^:]*:\s*(.*)', line, re.IGNORECASE)
+        if match:
+            answers[match.group(1)] = match.group(2).strip()
+    return answers
+
+
+def run_solution(year: int, day: int, include_scripts: bool=False) -> Dict[str, Any]:
+    result = {'year': year, 'day': day, 'mode': None, 'status': 'ok', 'parts': {}, 'error': None}
+    path = solution_path(year, day)
+    with open(path, 'r') as f:
+        source = f.read()
+
+    try:
+        steps = plan_solution(source)
+    except SyntaxError as e:
+        result.update(status='error', error=f'SyntaxError: {e}')
+        return result
+
+    if steps is None and not include_scripts:
+        result.update(mode='script', status='skipped')
+        return result
+
+    # Peak RSS is reset before each part, so the solution's peak is the largest of these
+    peak_rss = []
+
+    output = io.StringIO()
+    reset_peak_rss()
+    t0 = time.perf_counter()
+    with solution_context(year, day), contextlib.redirect_stdout(output):
+        try:
+            if steps is None:
+                result['mode'] = 'script'
+                runpy.run_path(path, run_name='__main__')
+                result['parts'] = {
+                    part: {'answer': answer, 'seconds': None, 'peak_rss_kb': None} 
+                    for part, answer in _scrape_answers(output.getvalue()).items()
+                }
+                if not result['parts']:
+                    result['output'] = output.getvalue().strip().splitlines()[-5:]
+            else:
+                result['mode'] = 'parts'
+                # Import under the name sibling solutions would use so worker pools can unpickle from it
+                spec = importlib.util.spec_from_file_location(f'day{day:>02}', path)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[spec.name] = module
+                spec.loader.exec_module(module)
+                namespace = module.__dict__
+                setup_seconds = 0.0
+                for step in steps:
+                    t_step = time.perf_counter()
+                    if step[0] == 'setup':
+                        exec(step[1], namespace)
+                        setup_seconds += time.perf_counter() - t_step
+                    else:
+                        peak_rss.append(peak_rss_kb())
+                        reset_peak_rss()
+                        answer = eval(step[2], namespace)
+                        seconds = time.perf_counter() - t_step
+                        peak_rss.append(peak_rss_kb())
+                        result['parts'][str(step[1])] = {
+                            'answer': _answer(answer),
+                            'seconds': seconds,
+                            'peak_rss_kb': peak_rss[-1],
+                        }
+                result['setup_seconds'] = setup_seconds
+        except (Exception, SystemExit):
+            result.update(status='error', error=traceback.format_exc(limit=-3))
+    result['seconds'] = time.perf_counter() - t0
+    peak_rss.append(peak_rss_kb())
+    result['peak_rss_kb'] = max((peak for peak in peak_rss if peak is not None), default=None)
+    return result
+
+
+def run_solutions(solutions: List[tuple], jobs: int=1, include_scripts: bool=False, on_result=None) -> List[Dict[str, Any]]:
+    results = []
+    # Solutions can share one process as long as the peak RSS can be reset between them
+    if jobs <= 1 and reset_peak_rss():
+        for year, day in solutions:
+            results.append(run_solution(year, day, include_scripts))
+            if on_result:
+                on_result(results[-1])
+    else:
+        # One task per child so peak RSS is per-solution rather than a running high-water mark
+        with ProcessPoolExecutor(max_workers=max(jobs, 1), max_tasks_per_child=1) as executor:
+            futures = [executor.submit(run_solution, year, day, include_scripts) for year, day in solutions]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if on_result:
+                    on_result(results[-1])
+    return sorted(results, key=lambda r: (r['year'], r['day']))
+
+
+def compare_to_baseline(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], slowdown: float=1.5) -> List[str]:
+    previous = {(r['year'], r['day']): r for r in baseline}
+    problems = []
+    for result in results:
+        old = previous.get((result['year'], result['day']))
+        if old is None or result['status'] != 'ok' or old['status'] != 'ok':
+            continue
+        for part, info in result['parts'].items():
+            old_info = old['parts'].get(part)
+            if old_info is None:
+                continue
+            label = f"{result['year']} day {result['day']:>02} part {part}"
+            if info['answer'] != old_info['answer']:
+                problems.append(f"{label}: answer changed from {old_info['answer']} to {info['answer']}")
+            if info['seconds'] and old_info['seconds'] and info['seconds'] > slowdown * max(old_info['seconds'], 0.01):
+                problems.append(f"{label}: {old_info['seconds']:.3f}s -> {info['seconds']:.3f}s")
+    return problems
+
+
+def write_run_report(results: List[Dict[str, Any]], filepath: str, jobs: int=1) -> str:
+    report = {
+        'generated': get_today().isoformat(),
+        'python': platform.python_version(),
+        'jobs': jobs,
+        'total_seconds': sum(r.get('seconds') or 0 for r in results),
+        'results': results,
+    }
+    tmp_filepath = filepath + '.tmp'
+    with open(tmp_filepath, 'w') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_filepath, filepath)
+    return filepath
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    label = f"{result['year']} day {result['day']:>02}"
+    if result['status'] != 'ok':
+        reason = result['error'].strip().splitlines()[-1] if result['error'] else result['mode']
+        return f'{label}: {result["status"]} ({reason})'
+    if not result['parts']:
+        return f"{label}: {' | '.join(result.get('output', []))} [{result['seconds']:.3f}s]"
+    parts = ', '.join(
+        f"part {part} = {info['answer']}" + (f" ({info['seconds']:.3f}s)" if info['seconds'] is not None else '')
+        for part, info in result['parts'].items()
+    )
+    return f"{label}: {parts} [{result['seconds']:.3f}s]"
+
+
 if __name__ == '__main__':
     
     today = get_today()
@@ -74,6 +511,24 @@ if __name__ == '__main__':
     parser_init = subparsers.add_parser('init', help='Initialize AoC files for the given day (defaults to today).')
     parser_init.add_argument('-d', '--day', type=int, default=today.day)
     parser_init.add_argument('-y', '--year', type=int, default=today.year)
+    parser_fetch = subparsers.add_parser('fetch', help='Download all missing puzzle inputs for the given years.')
+    parser_fetch.add_argument('-y', '--year', type=parse_years, default=list(range(2015, today.year + 1)), 
+                              help='Year, range (2015..2025) or list (2015,2017). Defaults to all years.')
+    parser_fetch.add_argument('-d', '--day', type=int, nargs='+', default=list(range(1, 26)))
+    parser_fetch.add_argument('-j', '--jobs', type=int, default=4, help='Number of concurrent connections.')
+    parser_fetch.add_argument('--rate', type=float, default=1.0, help='Maximum requests per second.')
+    parser_fetch.add_argument('--refresh', action='store_true', 
+                              help='Re-validate existing inputs (conditional requests using stored ETags).')
+    parser_fetch.add_argument('--base-url', default='https://adventofcode.com')
+    parser_run = subparsers.add_parser('run', help='Run solutions in-process and write a timing report.')
+    parser_run.add_argument('-y', '--year', type=parse_years, default=list(range(2015, today.year + 1)), 
+                            help='Year, range (2015..2025) or list (2015,2017). Defaults to all years.')
+    parser_run.add_argument('-d', '--day', type=int, nargs='+', default=None)
+    parser_run.add_argument('-j', '--jobs', type=int, default=1, help='Number of worker processes.')
+    parser_run.add_argument('-o', '--output', default=os.path.join(base_path, 'run_report.json'))
+    parser_run.add_argument('--include-scripts', action='store_true', 
+                            help='Also run old-style solutions (no part1/part2 layout) as scripts.')
+    parser_run.add_argument('--baseline', default=None, help='Previous report to check for answer changes and slowdowns.')
 
     init_args = parser.parse_args()
 
@@ -103,3 +558,44 @@ if __name__ == '__main__':
                 print(f'    Template .py file already exists in ./{year}/day{day:>02}.py')
             else:
                 print(f'    Template .py file written to {puzzle_input_path}')
+
+    elif init_args.subparser_name == 'run':
+        solutions = find_solutions(init_args.year, init_args.day)
+        print(f'Running {len(solutions)} solutions with {init_args.jobs} job(s)...')
+        results = run_solutions(
+            solutions, jobs=init_args.jobs, include_scripts=init_args.include_scripts, 
+            on_result=lambda result: print(f'    {format_result(result)}')
+        )
+
+        timed = [r for r in results if r['status'] == 'ok']
+        print(f'Ran {len(timed)} solutions in {sum(r["seconds"] for r in timed):.2f}s, slowest:')
+        for result in sorted(timed, key=lambda r: r['seconds'], reverse=True)[:10]:
+            print(f'    {result["year"]} day {result["day"]:>02}: {result["seconds"]:.3f}s')
+
+        if init_args.baseline:
+            with open(init_args.baseline, 'r') as f:
+                baseline = json.load(f)['results']
+            problems = compare_to_baseline(results, baseline)
+            print(f'{len(problems)} regression(s) compared to {init_args.baseline}')
+            for problem in problems:
+                print(f'    {problem}')
+
+        print(f'Report written to {write_run_report(results, init_args.output, init_args.jobs)}')
+
+    elif init_args.subparser_name == 'fetch':
+        targets = [(year, day) for year in init_args.year for day in init_args.day if valid_date(year, day)]
+        if cookie is None:
+            print(f'You must set the AOC_COOKIE environment variable to continue')
+        else:
+            print(f'Fetching inputs for {len(targets)} puzzles ({init_args.jobs} connections, {init_args.rate} requests/s)...')
+            def report_fetch(target, status):
+                if status != 'exists':
+                    print(f'    {target[0]} day {target[1]:>02}: {status}')
+
+            fetcher = InputFetcher(init_args.base_url, cookie, init_args.rate)
+            results = fetcher.fetch_all(targets, jobs=init_args.jobs, refresh=init_args.refresh, on_result=report_fetch)
+            counts = {}
+            for status in results.values():
+                status = 'error' if status.startswith('error') else status
+                counts[status] = counts.get(status, 0) + 1
+            print('Done: ' + ', '.join(f'{count} {status}' for status, count in sorted(counts.items())))
@@ -0,0 +1,126 @@
+'''
+Shared puzzle input loading for every year.
+
+Inputs are read once per (year, day) and cached, so running both parts (or every
+solution via `aoc.py run`) doesn't pay for re-reading and re-parsing. The puzzle
+day can be passed explicitly or is inferred from the calling dayNN.py module, which
+works whether the solution is run as a script or imported by the batch runner.
+'''
+from typing import Iterator, List, Optional, Tuple
+from functools import lru_cache
+import mmap
+import os
+import re
+import sys
+
+base_path = os.path.dirname(os.path.abspath(__file__))
+
+_solution_file_pattern = re.compile(r'day(\d+)\.py$')
+
+
+def input_path(year: int, day: int) -> str:
+    # 2015 onward use YEAR/inputs/dayNN.txt, the consolidated 2017/2018 repos used YEAR/data/dayNN_input.txt
+    candidates = [
+        os.path.join(base_path, f'{year}', 'inputs', f'day{day:>02}.txt'),
+        os.path.join(base_path, f'{year}', 'data', f'day{day:>02}_input.txt'),
+    ]
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    raise FileNotFoundError(f'No input file for {year} day {day}, expected {candidates[0]}')
+
+
+def calling_solution() -> Tuple[int, int]:
+    '''
+    Find the (year, day) of the nearest dayNN.py module on the call stack, falling
+    back to sys.argv[0] for code that isn't running inside a solution module.
+    '''
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_globals.get('__file__') or ''
+        match = _solution_file_pattern.search(os.path.basename(filename))
+        if match:
+            return int(os.path.basename(os.path.dirname(os.path.abspath(filename)))), int(match.group(1))
+        frame = frame.f_back
+
+    match = _solution_file_pattern.search(os.path.basename(sys.argv[0]))
+    if match is None:
+        raise ValueError('Could not infer the puzzle day, please pass it explicitly.')
+    return int(os.path.basename(os.path.dirname(os.path.abspath(sys.argv[0])))), int(match.group(1))
+
+
+@lru_cache(maxsize=None)
+def read_mmap(year: int, day: int) -> Optional[mmap.mmap]:
+    # Read-only mapping of the input file, kept open for the life of the process.
+    # Empty files can't be mapped, so those return None.
+    with open(input_path(year, day), 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_bytes(year: int, day: int) -> memoryview:
+    '''Zero-copy view of the raw input bytes.'''
+    mapped = read_mmap(year, day)
+    return memoryview(mapped if mapped is not None else b'')
+
+
+def iter_lines(year: int, day: int) -> Iterator[str]:
+    '''Lazily yield the input's lines (without line endings) straight from the mapped file.'''
+    mapped = read_mmap(year, day)
+    if mapped is None:
+        return
+    start = 0
+    while start < len(mapped):
+        end = mapped.find(b'\n', start)
+        if end == -1:
+            end = len(mapped)
+        yield mapped[start:end].decode('utf-8').rstrip('\r')
+        start = end + 1
+
+
+@lru_cache(maxsize=None)
+def read_raw_input(year: int, day: int) -> str:
+    # Same line endings as reading the file in text mode, whichever way the input was saved
+    return bytes(read_bytes(year, day)).decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+@lru_cache(maxsize=None)
+def read_input(year: int, day: int) -> str:
+    return read_raw_input(year, day).rstrip()
+
+
+@lru_cache(maxsize=None)
+def _read_lines(year: int, day: int) -> Tuple[str, ...]:
+    return tuple(line for line in read_raw_input(year, day).split('\n') if line.strip())
+
+
+def read_input_lines(year: int, day: int) -> List[str]:
+    # A fresh list each call since plenty of solutions mutate their input
+    return list(_read_lines(year, day))
+
+
+@lru_cache(maxsize=None)
+def read_blocks(year: int, day: int) -> Tuple[Tuple[str, ...], ...]:
+    '''Blank-line separated blocks of the input, each as a tuple of its lines.'''
+    return tuple(
+        tuple(block.split('\n')) for block in re.split(r'\n\s*\n', read_input(year, day)) if block.strip()
+    )
+
+
+@lru_cache(maxsize=None)
+def read_ints(year: int, day: int) -> Tuple[int, ...]:
+    '''Every integer in the input, in order. A dash between digits (e.g. 11-22) is a separator, not a sign.'''
+    return tuple(int(n) for n in re.findall(r'(?<!\d)-?\d+', read_raw_input(year, day)))
+
+
+@lru_cache(maxsize=None)
+def read_int_grid(year: int, day: int) -> Tuple[Tuple[int, ...], ...]:
+    '''Grid of single digit cells, e.g. a height or risk map.'''
+    return tuple(tuple(int(c) for c in line.strip()) for line in _read_lines(year, day))
+
+
+def clear_cache():
+    # Dropped mappings are closed once nothing references them any more
+    for cached in [read_mmap, read_raw_input, read_input, _read_lines, read_blocks, read_ints, read_int_grid]:
+        cached.cache_clear()